@@ -0,0 +1,52 @@
+"""
+Time one screen-clearing explosion, with hits applied one take_damage() call
+at a time and through the world's batched DamageQueue.
+
+Every enemy is inside the blast. "wound" leaves them all alive, "kill"
+kills them all, so deaths, death bursts and shard drops are included.
+
+    python -m benchmarks.area_damage --enemies 2000
+"""
+import argparse
+import time
+
+import pygame
+from benchmarks.common import init_headless, make_world
+from src.weapon import Projectile
+
+
+def explode(enemy_count, damage, batched, seed):
+    world = make_world(enemy_count, seed=seed, spread=900)
+    center = world.player.position
+    image = pygame.Surface((16, 16))
+    projectile = Projectile(center, center + (1, 0), 10, damage, 1000, image)
+    projectile.explosion_radius = 2000
+    index = world.get_enemy_index()
+    start = time.perf_counter()
+    projectile.strike(world.enemies[0], index, world.particles, world.damage if batched else None)
+    world.damage.flush()
+    elapsed = (time.perf_counter() - start) * 1000
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--enemies", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    init_headless()
+    print(f"enemies: {args.enemies}")
+    for name, damage in (("wound", 0.5), ("kill", 10**6)):
+        results = {}
+        for mode, batched in (("per hit", False), ("batched", True)):
+            # Best of `repeat`, each on a fresh world
+            results[mode] = min(explode(args.enemies, damage, batched, seed) for seed in range(args.repeat))
+        print(
+            f"{name:>6}: per hit {results['per hit']:7.2f} ms, batched {results['batched']:6.2f} ms "
+            f"({results['per hit'] / results['batched']:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Measure the enemy bullet store at bullet-hell counts, against the same
+bullets as Projectile objects each tested against the player on their own
+(how demons used to fire).
+
+Rings of bullets are fired from points around the player with ranges long
+enough that none expire during the measurement.
+
+    python -m benchmarks.bullets --bullets 5000 --ticks 120
+"""
+import argparse
+import math
+
+import numpy as np
+import pygame
+import settings
+from benchmarks.common import init_headless, make_world, time_per_call
+from src.bullets import BulletSystem
+from src.camera import Camera
+from src.weapon import Projectile
+
+RING = 50
+
+
+def fill(bullets, center, count, sprite):
+    rng = np.random.default_rng(0)
+    angles = np.arange(RING) * (math.tau / RING)
+    for _ in range(count // RING):
+        origin = center + (rng.uniform(-900, 900), rng.uniform(-500, 500))
+        bullets.spawn(origin, angles, 2, 1e6, 10, sprite)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bullets", type=int, default=5000)
+    parser.add_argument("--ticks", type=int, default=120)
+    args = parser.parse_args()
+
+    screen = init_headless()
+    world = make_world(0)
+    player = world.player
+    player.invincible = True  # hits are still tested, just not fatal
+    camera = Camera(settings.WIDTH, settings.HEIGHT, settings.WORLD_WIDTH, settings.WORLD_HEIGHT)
+    camera.update(player.rect)
+
+    bullets = BulletSystem(args.bullets)
+    sprite = bullets.sprite("assets/images/projectiles/Fireball1.png", 4)
+    fill(bullets, player.position, args.bullets, sprite)
+    image = bullets.textures[sprite * 16]
+    n = len(bullets)
+    projectiles = [
+        Projectile((x, y), (x + dx, y + dy), 2, 10, 1e6, image)
+        for (x, y), (dx, dy) in zip(bullets.position[:n].tolist(), bullets.velocity[:n].tolist())
+    ]
+    print(f"live bullets: {len(bullets)}")
+
+    def update_objects():
+        projectiles[:] = [p for p in projectiles if p.update([player])]
+
+    def draw_objects():
+        for projectile in projectiles:
+            projectile.draw(screen, camera)
+
+    budget = 1000 / settings.FPS
+    rows = (
+        ("update", time_per_call(update_objects, args.ticks), time_per_call(lambda: bullets.update(player), args.ticks)),
+        ("draw", time_per_call(draw_objects, args.ticks), time_per_call(lambda: bullets.draw(screen, camera), args.ticks)),
+    )
+    print(f"frame budget: {budget:.2f} ms")
+    for name, objects_ms, array_ms in rows:
+        print(f"{name:>6}: objects {objects_ms:7.2f} ms, arrays {array_ms:6.2f} ms ({array_ms / budget * 100:.1f}% budget)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare projectile hits with rects only and with the mask narrowphase
+(settings.COLLISION_MASKS_ENABLED).
+
+For every regular enemy type, shots fly straight across a lone enemy at
+random heights spread over its rect. Rects alone hit with every shot, so
+the share the masks reject is the share that only touched transparent
+pixels. Masks are built on a first pass, so the timed passes use the cache.
+
+    python -m benchmarks.collision_masks --shots 500
+"""
+import argparse
+import random
+import time
+
+import pygame
+import settings
+from benchmarks.common import init_headless, make_world
+from src.enemy import DEMON_TYPES, create_enemy, load_enemy_data
+from src.weapon import Projectile
+
+
+class HitCounter:
+    """Stands in for the world's DamageQueue, counting hits instead of dealing them."""
+
+    def __init__(self):
+        self.hits = 0
+
+    def add_many(self, targets, amount):
+        self.hits += 1
+
+
+def shoot(enemy, shots, image):
+    """(hits, microseconds per projectile update) for `shots` shots across `enemy`."""
+    rng = random.Random(1)
+    rect = enemy.rect
+    reach = (rect.height + image.get_height()) / 2
+    counter = HitCounter()
+    updates = 0
+    elapsed = 0.0
+    for _ in range(shots):
+        y = rect.centery + rng.uniform(-reach, reach)
+        projectile = Projectile((rect.left - 40, y), (rect.right, y), 12, 0, rect.width + 80, image)
+        start = time.perf_counter()
+        while True:
+            updates += 1
+            if not projectile.update([enemy], damage=counter):
+                break
+        elapsed += time.perf_counter() - start
+    return counter.hits, elapsed * 1e6 / updates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--shots", type=int, default=500)
+    args = parser.parse_args()
+
+    init_headless()
+    world = make_world(0)
+    image = pygame.transform.scale(pygame.image.load("assets/images/projectiles/Fireball1.png").convert_alpha(), (32, 32))
+    enemy_data = load_enemy_data("assets/config/enemies.json")
+
+    total = {"rects": [0, 0.0], "masks": [0, 0.0]}
+    types = [name for name in enemy_data if name not in DEMON_TYPES]
+    for enemy_type in types:
+        enemy = create_enemy(enemy_type, *world.player.position, enemy_data, world)
+        shoot(enemy, args.shots, image)  # build the mask caches
+        results = {}
+        for name, enabled in (("rects", False), ("masks", True)):
+            settings.COLLISION_MASKS_ENABLED = enabled
+            results[name] = shoot(enemy, args.shots, image)
+            total[name][0] += results[name][0]
+            total[name][1] += results[name][1] / len(types)
+        rejected = 1 - results["masks"][0] / max(1, results["rects"][0])
+        print(f"{enemy_type:>14}: {rejected:4.0%} of rect hits on transparent pixels")
+    rejected = 1 - total["masks"][0] / max(1, total["rects"][0])
+    print(f"{'all':>14}: {rejected:4.0%} of rect hits on transparent pixels")
+    for name, (_, microseconds) in total.items():
+        print(f"{name:>14}: {microseconds:.2f} us per projectile update")
+
+
+if __name__ == "__main__":
+    main()
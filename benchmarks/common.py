@@ -0,0 +1,60 @@
+"""
+Shared setup for the headless benchmarks.
+
+Run every benchmark from the repository root so asset paths resolve, e.g.:
+    python -m benchmarks.enemy_lod
+"""
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import settings
+
+
+def init_headless(width=1920, height=1080):
+    """Open a hidden display so images can be converted like in the game."""
+    pygame.init()
+    settings.WIDTH, settings.HEIGHT = width, height
+    return pygame.display.set_mode((width, height))
+
+
+def make_world(enemy_count, seed=0, spread=None):
+    """
+    Build a world with a player in the middle and `enemy_count` regular
+    enemies scattered uniformly within `spread` pixels of the player
+    (the whole world by default).
+    """
+    from loader import load_player_animations
+    from src.enemy import DEMON_TYPES, create_enemy, load_enemy_data
+    from src.game_state_manager import GameStateManager
+    from src.player import Player
+    from src.timer import Timer
+    from src.world import World
+
+    random.seed(seed)
+    enemy_data = load_enemy_data("assets/config/enemies.json")
+    enemy_types = [name for name in enemy_data if name not in DEMON_TYPES]
+
+    center_x, center_y = settings.WORLD_WIDTH / 2, settings.WORLD_HEIGHT / 2
+    player = Player(center_x, center_y, load_player_animations(), None, GameStateManager())
+    world = World(settings.WORLD_WIDTH, settings.WORLD_HEIGHT, player, Timer())
+    player.world = world
+
+    half = spread if spread is not None else settings.WORLD_WIDTH / 2
+    for _ in range(enemy_count):
+        x = center_x + random.uniform(-half, half)
+        y = center_y + random.uniform(-half, half)
+        world.add_enemy(create_enemy(random.choice(enemy_types), x, y, enemy_data, world))
+    return world
+
+
+def time_per_call(func, repeat):
+    """Average wall time of `func()` in milliseconds."""
+    import time
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
@@ -0,0 +1,37 @@
+"""
+Compare World.update cost with the enemy update LOD on and off.
+
+    python -m benchmarks.enemy_lod --enemies 1000 5000 10000 --ticks 120
+"""
+import argparse
+
+from benchmarks.common import init_headless, make_world, time_per_call
+
+
+def run(enemy_count, ticks):
+    results = {}
+    for lod in (False, True):
+        # Same seed for both runs so they step the same enemy layout
+        world = make_world(enemy_count, seed=1)
+        world.player.hp = float("inf")
+        world.enemy_lod = lod
+        results[lod] = time_per_call(world.update, ticks)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--enemies", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--ticks", type=int, default=120)
+    args = parser.parse_args()
+
+    init_headless()
+    print(f"{'enemies':>8} {'full ms/tick':>13} {'lod ms/tick':>12} {'speedup':>8}")
+    for enemy_count in args.enemies:
+        results = run(enemy_count, args.ticks)
+        print(f"{enemy_count:>8} {results[False]:>13.2f} {results[True]:>12.2f} "
+              f"{results[False] / results[True]:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
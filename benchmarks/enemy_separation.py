@@ -0,0 +1,34 @@
+"""
+Measure the enemy crowd separation stage against the frame budget.
+
+Enemies start packed around the player, which is the worst case for the stage.
+
+    python -m benchmarks.enemy_separation --enemies 1000 5000 --ticks 60
+"""
+import argparse
+
+import settings
+from benchmarks.common import init_headless, make_world, time_per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--enemies", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--ticks", type=int, default=60)
+    parser.add_argument("--spread", type=float, default=1500,
+                        help="half-size in pixels of the square enemies start in")
+    args = parser.parse_args()
+
+    init_headless()
+    budget = 1000 / settings.FPS
+    print(f"frame budget: {budget:.2f} ms")
+    print(f"{'enemies':>8} {'first tick ms':>14} {'settled ms/tick':>16} {'% budget':>9}")
+    for enemy_count in args.enemies:
+        world = make_world(enemy_count, seed=1, spread=args.spread)
+        first = time_per_call(world.separate_enemies, 1)
+        settled = time_per_call(world.separate_enemies, args.ticks)
+        print(f"{enemy_count:>8} {first:>14.2f} {settled:>16.2f} {settled / budget * 100:>8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measure the particle system with the cap full of live particles.
+
+Particles are spread over a screen-sized area around the camera so every one
+of them is drawn, which is the worst case for the draw pass.
+
+    python -m benchmarks.particles --particles 10000 --ticks 120
+"""
+import argparse
+
+import pygame
+import settings
+from benchmarks.common import init_headless, time_per_call
+from src.camera import Camera
+from src.particles import DEATH, HIT, IMPACT, ParticleSystem
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--particles", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=120)
+    args = parser.parse_args()
+
+    screen = init_headless()
+    camera = Camera(settings.WIDTH, settings.HEIGHT, settings.WORLD_WIDTH, settings.WORLD_HEIGHT)
+    center = pygame.math.Vector2(settings.WORLD_WIDTH / 2, settings.WORLD_HEIGHT / 2)
+    camera.update(pygame.Rect(center.x, center.y, 1, 1))
+
+    particles = ParticleSystem(args.particles)
+    rng = particles.rng
+    kinds = (HIT, IMPACT, DEATH)
+    for i in range(args.particles // 10):
+        # Long lifetimes so the cap stays full for the whole run
+        position = center + (rng.uniform(-900, 900), rng.uniform(-500, 500))
+        particles.emit(position, 10, kinds[i % 3], speed=60, lifetime=1e6)
+    print(f"live particles: {len(particles)} (cap {particles.capacity})")
+
+    clock = {"now": 0.0}
+
+    def update():
+        clock["now"] += 1 / settings.FPS
+        particles.update(clock["now"])
+
+    budget = 1000 / settings.FPS
+    update_ms = time_per_call(update, args.ticks)
+    draw_ms = time_per_call(lambda: particles.draw(screen, camera), args.ticks)
+    print(f"frame budget: {budget:.2f} ms")
+    print(f"update: {update_ms:.2f} ms/tick ({update_ms / budget * 100:.1f}% budget)")
+    print(f"draw:   {draw_ms:.2f} ms/frame ({draw_ms / budget * 100:.1f}% budget)")
+
+    # Expiry: everything dies on the same tick and is compacted away
+    particles.update(2e6)
+    print(f"after expiry: {len(particles)} live")
+
+
+if __name__ == "__main__":
+    main()
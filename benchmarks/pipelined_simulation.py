@@ -0,0 +1,169 @@
+"""
+Experiment: would pipelining the main loop help? The simulation runs on a
+worker thread and records each frame as RenderLists, which the main thread
+replays one tick later while the worker is already simulating the next tick.
+
+This lives here rather than in the game: on a single core it measured
+0.55x-0.99x of serial throughput, because recording and replaying a frame
+costs more than drawing it directly and only blits and flips release the
+GIL. Any gain needs several cores; run it there before reviving the idea.
+
+Enemies are packed around the player so both the simulation and the drawing
+have real work to do. Frames are run back to back without the frame-rate
+wait, so the numbers are the most frames per second each mode can sustain.
+
+    python -m benchmarks.pipelined_simulation --enemies 1500 --frames 300
+"""
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import benchmarks.common  # noqa: F401  (headless SDL drivers)
+import pygame
+import settings
+from src.clock import game_clock
+
+
+def _position(dest):
+    return pygame.Rect(dest) if isinstance(dest, pygame.Rect) else (dest[0], dest[1])
+
+
+class RenderList:
+    """
+    Stands in for a Surface in the game's draw code: blit, blits, fill and
+    pygame.draw.rect calls are recorded, with every position copied, and
+    replay() later runs them against a real surface. Only surfaces that are
+    never changed after being drawn end up in the list, so a finished list
+    is an immutable snapshot of the frame.
+    """
+
+    def __init__(self, size):
+        self.size = tuple(size)
+        self.ops = []
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        self.ops.append((pygame.Surface.blit, (source, _position(dest), area, special_flags)))
+
+    def blits(self, blit_sequence, doreturn=True):
+        sequence = [(source, _position(dest)) for source, dest in blit_sequence]
+        self.ops.append((pygame.Surface.blits, (sequence, False)))
+
+    def fill(self, color, rect=None):
+        self.ops.append((pygame.Surface.fill, (color, rect and pygame.Rect(rect))))
+
+    def replay(self, surface):
+        for operation, arguments in self.ops:
+            operation(surface, *arguments)
+
+
+_draw_rect = pygame.draw.rect
+
+
+def draw_rect(surface, color, rect, width=0, *args):
+    """pygame.draw.rect that also records onto a RenderList."""
+    if isinstance(surface, RenderList):
+        surface.ops.append((_draw_rect, (color, pygame.Rect(rect), width, *args)))
+        return None
+    return _draw_rect(surface, color, rect, width, *args)
+
+
+class Pipeline:
+    """Runs a Game's frames with the simulation one tick ahead on a worker thread."""
+
+    def __init__(self, game):
+        self.game = game
+        self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="simulation")
+        self.last_frame = None
+
+    def close(self):
+        self.worker.shutdown()
+
+    def simulate_and_record(self, event_list):
+        """Worker side: one gameplay tick, then record its frame."""
+        game = self.game
+        game.state_manager.handle_events(event_list)
+        game.state_manager.update()
+        hud_size = game.screen.get_size() if settings.HUD_NATIVE else game.render_size
+        frame = (RenderList(game.render_size), RenderList(hud_size))
+        game.draw_world(frame[0])
+        game.draw_hud(frame[1])
+        return frame
+
+    def show_frame(self, frame):
+        """Main-thread side: draw a recorded frame the same way Game.render() would."""
+        game = self.game
+        world_list, hud_list = frame
+        world_list.replay(game.render_surface)
+        if settings.HUD_NATIVE:
+            game.present_render_surface()
+            hud_list.replay(game.screen)
+        else:
+            hud_list.replay(game.render_surface)
+            game.present_render_surface()
+
+    def run_frame(self):
+        game_clock.tick()
+        next_frame = self.worker.submit(self.simulate_and_record, pygame.event.get())
+        if self.last_frame:
+            self.show_frame(self.last_frame)
+        pygame.display.flip()
+        self.last_frame = next_frame.result()
+
+
+def build_game(enemy_count, seed):
+    from game import Game
+    from src.enemy import DEMON_TYPES, create_enemy
+
+    random.seed(seed)
+    game = Game()
+    game.state_manager.switch_state("gameplay")
+    game.player.invincible = True  # keep the run going for the whole measurement
+    enemy_types = [name for name in game.enemy_data if name not in DEMON_TYPES]
+    center = game.player.position
+    for _ in range(enemy_count):
+        x = center.x + random.uniform(-1200, 1200)
+        y = center.y + random.uniform(-1200, 1200)
+        game.world.add_enemy(create_enemy(random.choice(enemy_types), x, y, game.enemy_data, game.world))
+    return game
+
+
+def measure(run_frame, frames):
+    for _ in range(10):  # warm-up
+        run_frame()
+    start = time.perf_counter()
+    for _ in range(frames):
+        run_frame()
+    return frames / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--enemies", type=int, default=1500)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    settings.QUALITY_GOVERNOR_ENABLED = False
+    pygame.draw.rect = draw_rect
+    print(f"cores: {os.cpu_count()}, enemies: {args.enemies}")
+    results = {"serial": measure(build_game(args.enemies, seed=1).run_frame, args.frames)}
+    pipeline = Pipeline(build_game(args.enemies, seed=1))
+    results["pipelined"] = measure(pipeline.run_frame, args.frames)
+    pipeline.close()
+    for name, fps in results.items():
+        print(f"{name:>10}: {fps:7.1f} frames/s ({1000 / fps:.2f} ms/frame)")
+    print(f"speedup: {results['pipelined'] / results['serial']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
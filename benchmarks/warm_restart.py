@@ -0,0 +1,76 @@
+"""
+Time a restart: from Game.reset_game() (pressing R on the pause or game over
+screen) to the end of the first gameplay frame of the new run, after a run
+has filled the world with enemies, shards, projectiles and effects. A cold
+rebuild of every game object plus its first frame (what a restart used to
+cost) is timed for comparison. The target for the warm restart is under 50 ms.
+
+    python -m benchmarks.warm_restart --enemies 2000 --restarts 10
+"""
+import argparse
+import random
+import time
+
+import benchmarks.common  # noqa: F401  (headless SDL drivers)
+import settings
+
+TARGET_MS = 50
+
+
+def fill_run(game, enemy_count):
+    """Play a little and pack the world so there is state to throw away."""
+    from src.enemy import DEMON_TYPES, create_enemy
+
+    game.state_manager.switch_state("gameplay")
+    enemy_types = [name for name in game.enemy_data if name not in DEMON_TYPES]
+    center = game.player.position
+    for _ in range(enemy_count):
+        x = center.x + random.uniform(-1500, 1500)
+        y = center.y + random.uniform(-1500, 1500)
+        game.world.add_enemy(create_enemy(random.choice(enemy_types), x, y, game.enemy_data, game.world))
+        game.world.add_astral_shard(x, y)
+    game.player.invincible = True
+    for _ in range(30):
+        game.run_frame()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--enemies", type=int, default=2000)
+    parser.add_argument("--restarts", type=int, default=10)
+    args = parser.parse_args()
+
+    from game import Game
+
+    settings.QUALITY_GOVERNOR_ENABLED = False
+    random.seed(1)
+    game = Game()
+
+    warm = []
+    for _ in range(args.restarts):
+        fill_run(game, args.enemies)
+        game.state_manager.switch_state("paused")
+        start = time.perf_counter()
+        game.state_manager.switch_state("start")
+        game.reset_game()
+        game.state_manager.switch_state("gameplay")
+        game.run_frame()
+        warm.append((time.perf_counter() - start) * 1000)
+
+    cold = []
+    for _ in range(args.restarts):
+        start = time.perf_counter()
+        game.initialize_game_objects(*game.render_size)
+        game.state_manager.switch_state("gameplay")
+        game.run_frame()  # builds the new world's tiled background
+        cold.append((time.perf_counter() - start) * 1000)
+
+    warm.sort()
+    cold.sort()
+    print(f"warm restart + first frame: median {warm[len(warm) // 2]:.1f} ms, worst {warm[-1]:.1f} ms"
+          f" (target < {TARGET_MS} ms)")
+    print(f"cold rebuild + first frame: median {cold[len(cold) // 2]:.1f} ms, worst {cold[-1]:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
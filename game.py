@@ -1,3 +1,4 @@
+import os
 import pygame
 import time
 import settings
@@ -8,6 +9,8 @@ from src.camera import Camera
 from src.enemy import EnemyManager, load_enemy_data
 from src.weapon import WeaponManager
 from src.ui import UI
+from src.image_cache import report_load_times
+from src.minimap import Minimap
 from src.shop_window import Shop
 from src.consumable import ConsumableManager
 from src.inventory import Inventory
@@ -15,9 +18,16 @@ from src.wave_manager import WaveManager
 from src.start_screen import StartScreen
 from src.game_state_manager import GameStateManager
 from src.timer import Timer
+from src.clock import game_clock
+from src.quality import QualityGovernor
+from src.scheduler import scheduler
 from src.pause_state import PausedState
 from src.shop_state import ShopState
 from src.end_screen import EndScreen
+from src.snapshot import save_snapshot, load_snapshot
+from src.trace import TickTracer
+from src.frame_times import FrameTimeRecorder
+from src import telemetry
 
 class GamePlay:
     def __init__(self, game_instance, timer):
@@ -40,7 +50,15 @@ class GamePlay:
         self.game.render()
 
 class Game:
+    config_dir = "assets/config"
+    starting_weapon = "basic_wand"
+    autosave = True
+    # Subsystems timed every frame, in milliseconds (see stage_times)
+    STAGES = ("events", "world", "weapons", "player", "pickups", "waves", "minimap", "render")
+
     def __init__(self):
+        # Before anything is loaded, so asset allocations are traced too
+        telemetry.start_tracing()
         pygame.init()
 
         # Set the display to fullscreen
@@ -51,28 +69,90 @@ class Game:
                 # Get fullscreen resolution
         display_info = pygame.display.Info()
         settings.WIDTH, settings.HEIGHT = display_info.current_w, display_info.current_h
+        self.render_scale_factor = 1.0
+        self.setup_render_surface()
 
         self.clock = pygame.time.Clock()
         self.running = True
+        self.tracer = None
+        if settings.TRACE_ENABLED:
+            self.tracer = TickTracer(settings.TRACE_PATH, self.STAGES, settings.TRACE_CAPACITY, settings.TRACE_MAX_ENEMIES)
+        self.frame_times = FrameTimeRecorder() if settings.FRAME_TIMES_ENABLED else None
         self.timer = Timer()
         self.state_manager = GameStateManager()
         self.font = pygame.font.Font("assets/fonts/dogicapixel.ttf", 16)
         
-        # Initialize the camera with fullscreen dimensions
-        self.camera = Camera(settings.WIDTH, settings.HEIGHT, settings.WORLD_WIDTH, settings.WORLD_HEIGHT)
+        # The camera sees the internal render resolution, not the display's
+        self.camera = Camera(*self.render_size, settings.WORLD_WIDTH, settings.WORLD_HEIGHT)
 
-        self.initialize_game_objects(settings.WIDTH, settings.HEIGHT)
-        self.state_manager.register_state("start", StartScreen(self.font, self.state_manager))
-        self.state_manager.register_state("gameplay", GamePlay(self, self.timer))
+        self.initialize_game_objects(*self.render_size)
+        report_load_times()
+        self.state_manager.register_state("start", StartScreen(self.font, self.state_manager, self))
+        self.gameplay_state = GamePlay(self, self.timer)
+        self.state_manager.register_state("gameplay", self.gameplay_state)
         self.state_manager.register_state("paused", PausedState(self.state_manager, self.font, self.timer, self))
         self.state_manager.register_state("shop", ShopState(self))
         self.state_manager.register_state("end", EndScreen(self.state_manager, self.font, self, self.player))
         self.state_manager.switch_state("start")
 
+        self.quality = QualityGovernor(self) if settings.QUALITY_GOVERNOR_ENABLED else None
+        self.show_debug_overlay = False
+        self.telemetry_overlay = telemetry.TelemetryOverlay(settings.TELEMETRY_OVERLAY_INTERVAL)
+
+    def config_path(self, file_name):
+        return os.path.join(self.config_dir, file_name)
+
+    def setup_render_surface(self):
+        """
+        Pick the internal resolution the world is drawn at (see RENDER_SCALE
+        in settings) and the surface to draw it on; at full scale that is
+        the display itself.
+        """
+        display_size = self.screen.get_size()
+        base_size = settings.RENDER_RESOLUTION or (
+            display_size[0] * settings.RENDER_SCALE, display_size[1] * settings.RENDER_SCALE
+        )
+        self.render_size = (
+            max(1, int(base_size[0] * self.render_scale_factor)),
+            max(1, int(base_size[1] * self.render_scale_factor)),
+        )
+        if self.render_size == display_size:
+            self.render_surface = self.screen
+        else:
+            self.render_surface = pygame.Surface(self.render_size).convert()
+        # Display pixels per internal pixel, for mouse-to-world conversion
+        self.render_ratio = (display_size[0] / self.render_size[0], display_size[1] / self.render_size[1])
+
+    def set_render_scale_factor(self, factor):
+        """Scale the internal resolution on top of the configured one (used by the quality governor)."""
+        self.render_scale_factor = factor
+        self.setup_render_surface()
+        self.camera.screen_width, self.camera.screen_height = self.render_size
+
+    def present_render_surface(self):
+        """Upscale the internal surface onto the display."""
+        if self.render_surface is self.screen:
+            return
+        if settings.RENDER_UPSCALE == "scale2x" and self.screen.get_size() == (
+            2 * self.render_size[0], 2 * self.render_size[1]
+        ):
+            pygame.transform.scale2x(self.render_surface, self.screen)
+        else:
+            pygame.transform.scale(self.render_surface, self.screen.get_size(), self.screen)
+
+    def screen_to_world(self, position):
+        """Convert a display position (e.g. the mouse) to world coordinates."""
+        return pygame.math.Vector2(
+            position[0] / self.render_ratio[0], position[1] / self.render_ratio[1]
+        ) + self.camera.offset
+
     def initialize_game_objects(self, screen_width, screen_height):
+        # Events belong to the objects of the previous run
+        scheduler.clear()
+
         # Load animations and data first
-        self.player_animations = load_player_animations()
-        self.enemy_data = load_enemy_data("assets/config/enemies.json")
+        self.player_animations = load_player_animations(self.config_path("animations.json"))
+        self.enemy_data = load_enemy_data(self.config_path("enemies.json"))
         
         # Initialize Player without the world reference
         self.player = Player(settings.WORLD_WIDTH / 2, settings.WORLD_HEIGHT / 2, self.player_animations, None, self.state_manager)
@@ -90,14 +170,14 @@ class Game:
         # Continue initializing other game objects
         self.player.inventory = Inventory()
         self.enemy_manager = EnemyManager(self.enemy_data, settings.WORLD_WIDTH, settings.WORLD_HEIGHT, self.world)
-        self.wave_manager = WaveManager("assets/config/waves.json", self.world, self.enemy_data, self.enemy_manager, self.camera, self.timer)
+        self.wave_manager = WaveManager(self.config_path("waves.json"), self.world, self.enemy_data, self.enemy_manager, self.camera, self.timer)
         self.wave_manager.start_wave(0)
+        self.autosave_wave_index = self.wave_manager.wave_index
         
         # Initialize and equip weapons
-        self.weapon_manager = WeaponManager("assets/config/weapons.json", self.player, self.world.projectiles)
-        basic_wand = self.weapon_manager.weapon_data["basic_wand"]
-        self.weapon_manager.equip_weapon("basic_wand")
-        self.player.inventory.equip("weapon", basic_wand)
+        self.weapon_manager = WeaponManager(self.config_path("weapons.json"), self.player, self.world.projectiles)
+        self.weapon_manager.equip_weapon(self.starting_weapon)
+        self.player.inventory.equip("weapon", self.weapon_manager.weapon_data[self.starting_weapon])
         
         # better_wand = self.weapon_manager.weapon_data["better_wand"]
         # self.weapon_manager.equip_weapon("better_wand")
@@ -105,20 +185,61 @@ class Game:
         
         # UI and other managers
         self.ui = UI(self.font, self.wave_manager, self.player)
-        self.consumable_manager = ConsumableManager("assets/config/consumables.json", self.timer)
-        self.shop = Shop(self.font, self.player, self.consumable_manager, "assets/config/shop_items.json")
+        self.minimap = None
+        if settings.MINIMAP_ENABLED:
+            self.minimap = Minimap(
+                self.world, settings.MINIMAP_SIZE, settings.MINIMAP_GRID,
+                settings.MINIMAP_UPDATE_INTERVAL, settings.MINIMAP_SATURATION,
+            )
+        self.consumable_manager = ConsumableManager(self.config_path("consumables.json"), self.timer)
+        self.shop = Shop(self.font, self.player, self.consumable_manager, self.config_path("shop_items.json"))
         
         # Game state tracking
         self.show_detailed_stats = True
+        self.stage_times = {}
         self.elapsed_pause_time = 0
         self.pause_start_time = None
 
 
     def reset_game(self):
-        self.initialize_game_objects()
+        """
+        Start a new run in place. Everything loaded from disk (sprites, fonts,
+        configs, the world background) and the game objects themselves are
+        kept; only the state of the run is reset.
+        """
+        start = time.perf_counter()
+        scheduler.clear()
         self.timer.reset()
+        self.player.reset(settings.WORLD_WIDTH / 2, settings.WORLD_HEIGHT / 2)
+        self.world.reset()
+        self.enemy_manager.enemies = []
+        self.weapon_manager.reset(self.starting_weapon)
+        self.player.inventory.equip("weapon", self.weapon_manager.weapon_data[self.starting_weapon])
         self.wave_manager.reset()
         self.wave_manager.start_wave(0)
+        self.autosave_wave_index = self.wave_manager.wave_index
+        self.shop.reset()
+        if self.minimap:
+            self.minimap.reset()
+        self.camera.update(self.player.rect)
+        self.stage_times = {}
+        self.elapsed_pause_time = 0
+        self.pause_start_time = None
+        if self.quality:
+            self.quality.apply()
+        print(f"Run reset in {(time.perf_counter() - start) * 1000:.1f} ms.")
+
+    def save_run(self):
+        save_snapshot(self, settings.SAVE_PATH)
+        print(f"Run saved to {settings.SAVE_PATH}.")
+
+    def has_save(self):
+        return os.path.exists(settings.SAVE_PATH)
+
+    def load_run(self):
+        load_snapshot(self, settings.SAVE_PATH)
+        self.autosave_wave_index = self.wave_manager.wave_index
+        print(f"Run loaded from {settings.SAVE_PATH}.")
 
     def handle_events(self, event_list):
         keys = pygame.key.get_pressed()
@@ -129,6 +250,10 @@ class Game:
                 if event.key == pygame.K_b:
                     if not self.shop.visible:
                         self.state_manager.switch_state("shop")
+                elif event.key == pygame.K_F3:
+                    self.show_debug_overlay = not self.show_debug_overlay
+                elif event.key == pygame.K_F4:
+                    telemetry.dump(self, settings.TELEMETRY_PATH)
                 elif not self.shop.visible:
                     for i in range(10):
                         if keys[pygame.K_1 + i]:
@@ -139,42 +264,110 @@ class Game:
         else:
             self.player.update(keys)
             if True:
-                world_mouse_position = pygame.math.Vector2(mouse_position) + self.camera.offset
+                world_mouse_position = self.screen_to_world(mouse_position)
                 self.weapon_manager.fire_weapon(self.player.position, world_mouse_position)
 
+    def mark_stage(self, name, stage_start):
+        """Record the time since `stage_start` under `name` and start the next stage."""
+        now = time.perf_counter()
+        self.stage_times[name] = (now - stage_start) * 1000
+        return now
+
     def update(self):
+        stage_start = time.perf_counter()
+        scheduler.run_due()
+        stage_start = self.mark_stage("events", stage_start)
         self.camera.update(self.player.rect)
         self.world.update()
+        stage_start = self.mark_stage("world", stage_start)
         self.enemy_manager.update(self.player, self.timer)
-        self.weapon_manager.update(self.world.enemies)
+        self.weapon_manager.update(self.world.enemies, self.world.get_enemy_index())
+        stage_start = self.mark_stage("weapons", stage_start)
         self.player.update_buffs()
-        self.player.inventory.update_consumables()
+        stage_start = self.mark_stage("player", stage_start)
         self.world.check_shard_collection(self.player)
+        stage_start = self.mark_stage("pickups", stage_start)
         self.wave_manager.update()
+        stage_start = self.mark_stage("waves", stage_start)
+        if self.minimap:
+            self.minimap.update(self.world.tick)
+        self.mark_stage("minimap", stage_start)
+
+        # Autosave whenever a new wave starts
+        if self.autosave and self.wave_manager.wave_index != self.autosave_wave_index:
+            self.autosave_wave_index = self.wave_manager.wave_index
+            self.save_run()
 
     def render(self):
-        self.screen.fill((0, 0, 0))
-        self.world.draw(self.screen, self.camera)
-        self.player.draw(self.screen, self.camera)
-        self.enemy_manager.draw(self.screen, self.camera)
-        self.weapon_manager.draw(self.screen, self.camera)
-        self.ui.draw_inventory(self.screen, self.player.inventory)
-        self.ui.draw_shards(self.screen, self.player)
-        self.ui.draw_game_time(self.screen, self.timer)
+        stage_start = time.perf_counter()
+        self.draw_world(self.render_surface)
+        if settings.HUD_NATIVE:
+            self.present_render_surface()
+            self.draw_hud(self.screen)
+        else:
+            self.draw_hud(self.render_surface)
+            self.present_render_surface()
+        self.mark_stage("render", stage_start)
+
+    def draw_world(self, surface):
+        surface.fill((0, 0, 0))
+        self.world.draw(surface, self.camera)
+        self.player.draw(surface, self.camera)
+        self.enemy_manager.draw(surface, self.camera)
+        self.weapon_manager.draw(surface, self.camera)
+
+    def draw_hud(self, surface):
+        self.ui.draw_inventory(surface, self.player.inventory)
+        self.ui.draw_shards(surface, self.player)
+        self.ui.draw_game_time(surface, self.timer)
         if self.show_detailed_stats:
-            self.ui.draw_stats(self.screen, self.player)
-        self.shop.draw(self.screen)
+            self.ui.draw_stats(surface, self.player)
+        if self.minimap:
+            self.minimap.draw(surface, self.player, self.camera)
+        if self.show_debug_overlay:
+            self.ui.draw_debug_overlay(surface, self.debug_overlay_lines())
+        self.shop.draw(surface)
+
+    def debug_overlay_lines(self):
+        lines = [
+            f"FPS: {self.clock.get_fps():.0f}",
+            f"Render: {self.render_size[0]}x{self.render_size[1]}",
+            f"Enemies: {len(self.world.enemies)}  Particles: {len(self.world.particles)}"
+            f"  Texts: {len(self.world.floating_texts)}",
+        ]
+        if self.quality:
+            lines.append(f"Frame: {self.quality.average_ms:.1f}/{self.quality.budget_ms:.1f} ms")
+            lines.extend(f"{step.replace('_', ' ').capitalize()}: {state}" for step, state in self.quality.describe())
+        lines.extend(self.telemetry_overlay.lines(self))
+        return lines
+
+    def run_frame(self):
+        """One pass of the main loop, without waiting for the next frame."""
+        frame_start = time.perf_counter()
+        game_clock.tick()
+        event_list = pygame.event.get()
+        for event in event_list:
+            if event.type == pygame.QUIT:
+                self.running = False
+        self.state_manager.handle_events(event_list)
+        self.state_manager.update()
+        self.state_manager.render(self.screen)
         pygame.display.flip()
+        if self.state_manager.current_state is self.gameplay_state:
+            frame_ms = (time.perf_counter() - frame_start) * 1000
+            if self.tracer:
+                self.tracer.record(self, frame_ms)
+            if self.frame_times:
+                self.frame_times.record_game(self, frame_ms)
+            if self.quality:
+                self.quality.record(frame_ms)
 
     def run(self):
         while self.running:
-            event_list = pygame.event.get()
-            for event in event_list:
-                if event.type == pygame.QUIT:
-                    self.running = False
-            self.state_manager.handle_events(event_list)
-            self.state_manager.update()
-            self.state_manager.render(self.screen)
-            pygame.display.flip()
+            self.run_frame()
             self.clock.tick(settings.FPS)
+        if self.tracer:
+            self.tracer.close()
+        if self.frame_times:
+            self.frame_times.export(settings.FRAME_TIMES_PATH)
         pygame.quit()
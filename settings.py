@@ -1,7 +1,104 @@
 global WIDTH, HEIGHT
 FPS = 60
+SAVE_PATH = "savegame.bin"
+
+# Per-tick world trace for post-mortems (see src/trace.py). Keeps the last
+# TRACE_CAPACITY ticks and the first TRACE_MAX_ENEMIES enemies of each tick.
+TRACE_ENABLED = False
+TRACE_PATH = "trace.bin"
+TRACE_CAPACITY = 5 * 60 * 60
+TRACE_MAX_ENEMIES = 128
 WORLD_WIDTH, WORLD_HEIGHT = 10240, 10240
 
+# The world is drawn at an internal resolution and upscaled to the display:
+# RENDER_RESOLUTION fixes it (e.g. (1920, 1080)), otherwise it is the display
+# size times RENDER_SCALE. "scale2x" is used when the display is exactly twice
+# the internal size, anything else upscales with nearest neighbour. The HUD
+# and shop are drawn after the upscale at native size when HUD_NATIVE is set.
+RENDER_RESOLUTION = None
+RENDER_SCALE = 1.0
+RENDER_UPSCALE = "nearest"
+HUD_NATIVE = True
+
+# Decoded sprite sheets are cached here as raw pixels (see src/image_cache.py)
+ASSET_CACHE_ENABLED = True
+ASSET_CACHE_DIR = ".cache/images"
+# List every image with its load time, not just the total
+ASSET_LOAD_TIMES_DEBUG = False
+
+# Enemy update LOD: enemies farther than `radius` pixels from the player are
+# only stepped every `interval` ticks (round-robin), with a larger step and
+# no contact checks. Keep the first radius outside the visible screen.
+ENEMY_LOD_ENABLED = True
+ENEMY_LOD_TIERS = [(1600, 2), (3200, 4)]  # (radius, interval), ascending
+
+# Size in pixels of one cell of the shared enemy flow field
+FLOW_FIELD_CELL_SIZE = 128
+
+# Crowd separation: overlapping enemies are pushed apart each tick. Pairs are
+# found through a grid of this cell size; enemies with a "separation_radius"
+# over half of it are paired on a second, coarser grid sized to the largest
+# of them, so no overlapping pair is ever missed. Off by default: with enemies
+# packed around the player, benchmarks/enemy_separation measures about 2 ms
+# per tick at 1000 enemies and 5 ms at 2000, but 16-22 ms at 5000, which is
+# the whole frame budget on its own.
+ENEMY_SEPARATION_ENABLED = False
+ENEMY_SEPARATION_CELL_SIZE = 96
+ENEMY_SEPARATION_STRENGTH = 0.5  # fraction of the overlap resolved per tick
+
+# Cell size of the per-tick enemy index used for projectile broadphase
+ENEMY_INDEX_CELL_SIZE = 128
+
+# Pixel-accurate projectile hits: after the rect test passes, the projectile's
+# and the enemy's cached masks must overlap too
+COLLISION_MASKS_ENABLED = True
+
+# Floating combat text: hits on the same target within the merge window are
+# summed into one number, and at most FLOATING_TEXT_LIMIT texts are shown
+FLOATING_TEXT_LIMIT = 64
+FLOATING_TEXT_MERGE_WINDOW = 0.25  # seconds
+
+# Adaptive quality (see src/quality.py): frame time is averaged over
+# QUALITY_WINDOW frames; above QUALITY_REDUCE_AT of the frame budget the next
+# optional feature is reduced, and after QUALITY_RESTORE_WINDOWS windows in a
+# row below QUALITY_RESTORE_AT the last one is restored.
+QUALITY_GOVERNOR_ENABLED = True
+QUALITY_WINDOW = 60
+QUALITY_REDUCE_AT = 0.9
+QUALITY_RESTORE_AT = 0.6
+QUALITY_RESTORE_WINDOWS = 3
+QUALITY_PARTICLE_DENSITY = 0.25
+QUALITY_LOD_INTERVAL_SCALE = 2
+QUALITY_RENDER_SCALE = 0.5  # relative to the configured render scale
+
+# Minimap: enemies and shards are binned into a MINIMAP_GRID x MINIMAP_GRID
+# density grid every MINIMAP_UPDATE_INTERVAL ticks; a cell with
+# MINIMAP_SATURATION or more of them is drawn at full strength
+MINIMAP_ENABLED = True
+MINIMAP_SIZE = 192
+MINIMAP_GRID = 64
+MINIMAP_UPDATE_INTERVAL = 10
+MINIMAP_SATURATION = 8
+
+# Frame-time histograms per wave and stage (see src/frame_times.py), written
+# to FRAME_TIMES_PATH + ".json"/".csv" on exit
+FRAME_TIMES_ENABLED = False
+FRAME_TIMES_PATH = "frame_times"
+
+# Memory telemetry (see src/telemetry.py): F4 writes it to TELEMETRY_PATH.
+# Python allocations are only traced with TELEMETRY_TRACEMALLOC on, which
+# slows the game down noticeably.
+TELEMETRY_PATH = "telemetry.json"
+TELEMETRY_TRACEMALLOC = False
+TELEMETRY_TRACEMALLOC_FRAMES = 1
+TELEMETRY_OVERLAY_INTERVAL = 30  # ticks between surface counts in the overlay
+
+# Hard cap on live hit/death particles
+PARTICLE_LIMIT = 10000
+
+# Hard cap on live enemy bullets (see src/bullets.py)
+BULLET_LIMIT = 20000
+
 # Colors
 WHITE = (255,255,255)
 BLACK = (0,0,0)
@@ -0,0 +1,145 @@
+"""
+Batch-simulate headless runs to balance waves.json / enemies.json.
+
+Every (variant, policy, seed) combination is played by a bot on a worker
+process and the results are aggregated into a single report:
+
+    python simulate.py --runs 200 --policy idle kite --variant assets/config my_variant/ --out report.json
+
+A variant is a directory holding any of the config files; files it doesn't
+contain fall back to assets/config. Runs are deterministic per seed.
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import time
+
+
+def init_worker():
+    from src.headless import init_headless_display
+    init_headless_display()
+
+
+def run_job(job):
+    from src.headless import run_simulation
+    seed, variant, policy, max_seconds, telemetry_dir, record_frame_times = job
+    telemetry_path = None
+    if telemetry_dir:
+        variant_name = os.path.basename(os.path.normpath(variant))
+        telemetry_path = os.path.join(telemetry_dir, f"telemetry_{variant_name}_{policy}_{seed}.json")
+    # The game prints every spawn; keep worker output quiet
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run_simulation(seed, variant, policy, max_seconds, telemetry_path, record_frame_times)
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def aggregate(results):
+    """Group runs by (variant, policy) and summarize each wave across seeds."""
+    report = []
+    key = lambda result: (result["variant"], result["policy"])
+    for (variant, policy), runs in itertools.groupby(sorted(results, key=key), key=key):
+        runs = list(runs)
+        per_wave = {}
+        for run in runs:
+            for wave in run["waves"]:
+                per_wave.setdefault(wave["wave"], []).append(wave)
+
+        waves = []
+        for wave_number in sorted(per_wave):
+            records = per_wave[wave_number]
+            cleared = [record["time"] for record in records if record["cleared"]]
+            waves.append({
+                "wave": wave_number,
+                "reached": len(records),
+                "survival_rate": sum(record["survived"] for record in records) / len(records),
+                "clear_rate": len(cleared) / len(records),
+                "time_to_clear_mean": mean(cleared),
+                "time_to_clear_p90": percentile(cleared, 0.9),
+                "shards_earned_mean": mean([record["shards_earned"] for record in records]),
+                "frame_ms_mean": mean([record["frame_ms_mean"] for record in records]),
+                "frame_ms_p95": percentile([record["frame_ms_p95"] for record in records], 0.95),
+                "frame_ms_max": max(record["frame_ms_max"] for record in records),
+            })
+
+        report.append({
+            "variant": variant,
+            "policy": policy,
+            "runs": len(runs),
+            "deaths": sum(run["died"] for run in runs),
+            "waves": waves,
+        })
+    return report
+
+
+def print_report(report):
+    for group in report:
+        print(f"\n{group['variant']} / {group['policy']}: {group['runs']} runs, {group['deaths']} deaths")
+        print(f"{'wave':>5} {'reached':>8} {'survival':>9} {'cleared':>8} {'clear s':>8} {'shards':>7} {'ms/tick':>8} {'p95 ms':>7}")
+        for wave in group["waves"]:
+            print(f"{wave['wave']:>5} {wave['reached']:>8} {wave['survival_rate']:>8.0%} {wave['clear_rate']:>8.0%} "
+                  f"{wave['time_to_clear_mean']:>8.1f} {wave['shards_earned_mean']:>7.1f} "
+                  f"{wave['frame_ms_mean']:>8.2f} {wave['frame_ms_p95']:>7.2f}")
+
+
+def main():
+    from src.headless import POLICIES
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="seeds per variant and policy")
+    parser.add_argument("--seed", type=int, default=0, help="first seed")
+    parser.add_argument("--variant", nargs="+", default=["assets/config"], help="config directories")
+    parser.add_argument("--policy", nargs="+", default=["kite"], choices=sorted(POLICIES))
+    parser.add_argument("--max-minutes", type=float, default=20, help="simulated time limit per run")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--out", help="write the full report (and raw runs) as JSON")
+    parser.add_argument("--telemetry-dir", help="write each run's memory telemetry here at the end of the run")
+    parser.add_argument("--frame-times", help="write per-wave frame-time percentiles of all runs to FRAME_TIMES.json/.csv")
+    args = parser.parse_args()
+    if args.telemetry_dir:
+        os.makedirs(args.telemetry_dir, exist_ok=True)
+
+    jobs = [
+        (seed, variant, policy, args.max_minutes * 60, args.telemetry_dir, bool(args.frame_times))
+        for variant in args.variant
+        for policy in args.policy
+        for seed in range(args.seed, args.seed + args.runs)
+    ]
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.processes, initializer=init_worker) as pool:
+        results = []
+        for done, result in enumerate(pool.imap_unordered(run_job, jobs), start=1):
+            results.append(result)
+            print(f"\r{done}/{len(jobs)} runs", end="", flush=True)
+    print(f"\nSimulated {len(jobs)} runs on {args.processes} processes in {time.perf_counter() - start:.1f}s")
+
+    results.sort(key=lambda result: (result["variant"], result["policy"], result["seed"]))
+    if args.frame_times:
+        from src.frame_times import FrameTimeRecorder
+        frame_times = FrameTimeRecorder()
+        for result in results:
+            frame_times.merge(result.pop("frame_times"))
+        frame_times.export(args.frame_times)
+    report = aggregate(results)
+    print_report(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"report": report, "runs": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
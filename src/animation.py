@@ -0,0 +1,115 @@
+import pygame
+from src.image_cache import load_image
+
+# Clip sets already built, keyed by archetype (see get_clip_set)
+_clip_sets = {}
+
+
+class ClipSet:
+    """
+    Every frame an archetype can show, built once and shared by all of its
+    instances: each named clip has its frames and a mirrored copy of them.
+    Collision masks are built with the frames, up front: building one locks
+    its surface, which mustn't happen while another thread blits it (see
+    benchmarks/pipelined_simulation.py).
+    """
+
+    def __init__(self, clips, fps):
+        self.names = list(clips)
+        self.ids = {name: clip_id for clip_id, name in enumerate(self.names)}
+        self.frames = [list(frames) for frames in clips.values()]
+        self.flipped = [[pygame.transform.flip(frame, True, False) for frame in frames] for frames in self.frames]
+        self.lengths = [len(frames) for frames in self.frames]
+        self.fps = fps
+        self.masks = [[pygame.mask.from_surface(frame) for frame in frames] for frames in self.frames]
+        self.flipped_masks = [[pygame.mask.from_surface(frame) for frame in frames] for frames in self.flipped]
+
+    def frame(self, clip_id, index, facing_right=True):
+        return (self.frames if facing_right else self.flipped)[clip_id][index]
+
+    def mask(self, clip_id, index, facing_right=True):
+        return (self.masks if facing_right else self.flipped_masks)[clip_id][index]
+
+
+def get_clip_set(key, build):
+    """Return the clip set for `key`, calling `build()` only the first time."""
+    clip_set = _clip_sets.get(key)
+    if clip_set is None:
+        clip_set = _clip_sets[key] = build()
+    return clip_set
+
+
+def animations_clip_set(animations, fps):
+    """
+    Clip set for a dict of clip name -> frames, as loaded by
+    loader.load_animations. Keyed by the frame surfaces themselves, so
+    passing the same loaded frames again reuses it while different frames
+    get their own. The clip set holds those surfaces, so their ids stay
+    unique while it is cached.
+    """
+    key = (tuple((name, tuple(map(id, frames))) for name, frames in animations.items()), fps)
+    return get_clip_set(key, lambda: ClipSet(animations, fps))
+
+
+def image_clip_set(path, size=1, frame_count=1, fps=6):
+    """
+    Clip set with a single "Idle" clip cut from a horizontal strip of
+    `frame_count` frames, scaled by `size`. Shared by everything using the
+    same image and size.
+    """
+    def build():
+        sheet = load_image(path)
+        frame_width = sheet.get_width() // frame_count
+        frame_height = sheet.get_height()
+        scaled_size = (int(frame_width * size), int(frame_height * size))
+        frames = [
+            pygame.transform.scale(sheet.subsurface((i * frame_width, 0, frame_width, frame_height)), scaled_size)
+            for i in range(frame_count)
+        ]
+        return ClipSet({"Idle": frames}, fps)
+
+    return get_clip_set((path, size, frame_count, fps), build)
+
+
+class Animation:
+    """
+    Per-instance animation state: which clip is playing, the current frame
+    and a phase offset (in frames) so instances don't all move in lockstep.
+    The frame images themselves live in the shared ClipSet.
+    """
+    __slots__ = ("clip_set", "clip", "frame", "phase")
+
+    def __init__(self, clip_set, clip="Idle", phase=0):
+        self.clip_set = clip_set
+        self.clip = clip_set.ids[clip]
+        self.frame = 0
+        self.phase = phase
+
+    def play(self, clip, now):
+        """Switch clips, starting the new one from its first frame at `now`."""
+        clip_id = self.clip_set.ids[clip]
+        if clip_id != self.clip:
+            self.clip = clip_id
+            self.frame = 0
+            self.phase = -int(now * self.clip_set.fps)
+
+    def image(self, facing_right=True):
+        return self.clip_set.frame(self.clip, self.frame, facing_right)
+
+    def mask(self, facing_right=True):
+        return self.clip_set.mask(self.clip, self.frame, facing_right)
+
+
+def advance_animations(animations, now):
+    """
+    Set the frame of every animation for game time `now` in one pass. The
+    frame follows from the time directly, so each instance costs a single
+    integer update however long it has been since the last pass.
+    """
+    steps = {}
+    for animation in animations:
+        clip_set = animation.clip_set
+        step = steps.get(clip_set)
+        if step is None:
+            step = steps[clip_set] = int(now * clip_set.fps)
+        animation.frame = (step + animation.phase) % clip_set.lengths[animation.clip]
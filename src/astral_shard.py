@@ -1,12 +1,90 @@
+"""
+Astral shards lying in the world, waiting to be collected.
+
+Shards are rows in a NumPy array of positions, like bullets and particles,
+so a mass kill dropping tens of thousands of them is one array append
+rather than an object per shard. Collection tests every shard against the
+player's rect at once, and drawing culls to the screen and issues a single
+`blits` call.
+"""
+from itertools import repeat
+
+import numpy as np
 import pygame
 
-class AstralShard:
-    def __init__(self, x, y,size=(32,32)):
-        self.position = pygame.math.Vector2(x, y)
-        original_image = pygame.image.load("assets/images/items/astral_shard.png").convert_alpha()
-        self.image = pygame.transform.scale(original_image, size)
-        self.rect = self.image.get_rect(center=(x, y))
+IMAGE = "assets/images/items/astral_shard.png"
+SIZE = (32, 32)
+
+# Scaled shard images by size, shared by every shard
+_images = {}
+
+
+def shard_image(size):
+    image = _images.get(size)
+    if image is None:
+        original_image = pygame.image.load(IMAGE).convert_alpha()
+        image = _images[size] = pygame.transform.scale(original_image, size)
+    return image
+
+
+class AstralShards:
+    def __init__(self, capacity=256, size=SIZE):
+        self.count = 0
+        self.position = np.zeros((capacity, 2), np.float32)
+        self.size = size
+        self.image = None  # loaded on first draw, so headless runs never need it
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def positions(self):
+        return self.position[:self.count]
+
+    def add(self, positions):
+        """Drop a shard at every row of `positions`. The store grows as needed."""
+        positions = np.asarray(positions, np.float32).reshape(-1, 2)
+        end = self.count + len(positions)
+        if end > len(self.position):
+            grown = np.zeros((max(end, 2 * len(self.position)), 2), np.float32)
+            grown[:self.count] = self.positions
+            self.position = grown
+        self.position[self.count:end] = positions
+        self.count = end
+
+    def clear(self):
+        self.count = 0
+
+    def collect(self, rect):
+        """Remove the shards overlapping `rect` and return how many there were."""
+        n = self.count
+        if not n:
+            return 0
+        half_width, half_height = self.size[0] / 2, self.size[1] / 2
+        x, y = self.position[:n, 0], self.position[:n, 1]
+        hit = (
+            (x + half_width > rect.left) & (x - half_width < rect.right)
+            & (y + half_height > rect.top) & (y - half_height < rect.bottom)
+        )
+        collected = int(np.count_nonzero(hit))
+        if collected:
+            kept = n - collected
+            self.position[:kept] = self.position[:n][~hit]
+            self.count = kept
+        return collected
 
     def draw(self, screen, camera):
-        screen_position = camera.apply(self.rect)
-        screen.blit(self.image, screen_position.topleft)
+        n = self.count
+        if not n:
+            return
+        if self.image is None:
+            self.image = shard_image(self.size)
+        width, height = screen.get_size()
+        shard_width, shard_height = self.size
+        x = self.position[:n, 0] - shard_width / 2 - camera.offset.x
+        y = self.position[:n, 1] - shard_height / 2 - camera.offset.y
+        visible = (x > -shard_width) & (x < width) & (y > -shard_height) & (y < height)
+        if not visible.any():
+            return
+        points = np.column_stack((x[visible], y[visible])).astype(np.int32).tolist()
+        screen.blits(zip(repeat(self.image), points), doreturn=False)
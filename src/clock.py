@@ -0,0 +1,55 @@
+import pygame
+
+
+class GameClock:
+    """
+    The one place gameplay reads time from. It is sampled once per tick, so
+    every system sees the same time for a whole frame, and exposes:
+      - real_time: wall-clock seconds (or fixed steps in headless runs)
+      - game_time: seconds of actual play; it stops while paused, so buffs,
+        cooldowns and invincibility don't run out in the pause menu or shop
+    """
+
+    def __init__(self):
+        self.fixed_step = False
+        self.source_ms = 0
+        self.real_ms = 0
+        self.game_ms = 0
+        self.paused = True
+
+    def _read_source(self):
+        return self.source_ms if self.fixed_step else pygame.time.get_ticks()
+
+    def tick(self):
+        """Sample the time for this frame. Call exactly once per frame."""
+        now = self._read_source()
+        if not self.paused:
+            self.game_ms += now - self.real_ms
+        self.real_ms = now
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    @property
+    def real_time(self):
+        return self.real_ms / 1000
+
+    @property
+    def game_time(self):
+        return self.game_ms / 1000
+
+    def use_fixed_step(self):
+        """Restart from zero and only move forward through advance()."""
+        self.fixed_step = True
+        self.source_ms = self.real_ms = self.game_ms = 0
+
+    def advance(self, milliseconds):
+        """Step a fixed-step clock forward and sample the new time."""
+        self.source_ms += milliseconds
+        self.tick()
+
+
+game_clock = GameClock()
@@ -1,6 +1,8 @@
 import pygame
 import json
 import logging
+from src.clock import game_clock
+from src.scheduler import scheduler
 
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(message)s")
 
@@ -15,12 +17,14 @@ class Consumable:
         self.start_time = None
         self.is_active = False
         self.is_used = False
+        self.on_expire = None
 
-    def apply_effect(self, player):
+    def apply_effect(self, player, on_expire=None):
         if not self.is_active:
             self.is_active = True
             self.is_used = True
-            self.start_time = pygame.time.get_ticks() / 1000
+            self.start_time = game_clock.game_time
+            self.schedule_expiry(on_expire)
             if self.effect == "heal":
                 player.hp = min(player.hp + self.magnitude, player.max_hp)
                 logging.info(f"{self.name} applied: Heal {self.magnitude}")
@@ -28,15 +32,19 @@ class Consumable:
                 player.add_buff(self.effect, self.magnitude, self.duration)
                 logging.info(f"{self.name} applied: {self.effect.capitalize()} +{self.magnitude} for {self.duration}s")
 
-    def update(self):
-        if self.is_active and self.start_time is not None:
-            elapsed_time = pygame.time.get_ticks() / 1000 - self.start_time
-            if elapsed_time >= self.duration:
-                self.is_active = False
+    def schedule_expiry(self, on_expire=None):
+        """Run expire() (and then `on_expire(self)`) once the duration is up."""
+        self.on_expire = on_expire
+        scheduler.call_at(self.start_time + self.duration, self.expire)
+
+    def expire(self):
+        self.is_active = False
+        if self.on_expire:
+            self.on_expire(self)
 
     def get_time_remaining(self):
         if self.is_active and self.start_time is not None:
-            elapsed_time = pygame.time.get_ticks() / 1000 - self.start_time
+            elapsed_time = game_clock.game_time - self.start_time
             return max(0, self.duration - elapsed_time)
         return 0
 
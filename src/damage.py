@@ -0,0 +1,75 @@
+"""
+Enemy damage applied a tick at a time.
+
+Player projectiles and explosions queue their hits here instead of calling
+Enemy.take_damage once per hit. flush() sums the hits per enemy, subtracts
+them from all the HPs in one NumPy operation and then handles the feedback
+in batches: damage numbers, hit sparks, death bursts and shard drops.
+"""
+from itertools import chain, repeat
+
+import numpy as np
+
+DAMAGE_COLOR = (255, 0, 0)
+
+
+def positions_of(entities):
+    count = len(entities)
+    return np.fromiter(
+        chain.from_iterable(entity.position for entity in entities), float, 2 * count
+    ).reshape(count, 2)
+
+
+class DamageQueue:
+    def __init__(self, world):
+        self.world = world
+        self.targets = []
+        self.amounts = []
+
+    def __len__(self):
+        return len(self.targets)
+
+    def add(self, target, amount):
+        self.targets.append(target)
+        self.amounts.append(amount)
+
+    def add_many(self, targets, amount):
+        """Hit every one of `targets` for `amount`, e.g. an explosion."""
+        self.targets.extend(targets)
+        self.amounts.extend(repeat(amount, len(targets)))
+
+    def clear(self):
+        self.targets = []
+        self.amounts = []
+
+    def flush(self):
+        """Apply the queued hits and return the enemies they killed."""
+        if not self.targets:
+            return []
+        targets, amounts = self.targets, self.amounts
+        self.clear()
+
+        # Several hits on one enemy add up to a single damage number
+        slots = {}
+        index = np.fromiter((slots.setdefault(id(target), len(slots)) for target in targets), np.intp, len(targets))
+        hit = list({id(target): target for target in targets}.values())
+        totals = np.bincount(index, amounts, len(hit))
+        hp = np.fromiter((enemy.hp for enemy in hit), float, len(hit))
+        remaining = hp - totals
+        for enemy, value in zip(hit, remaining.tolist()):
+            enemy.hp = value
+
+        world = self.world
+        world.add_damage_numbers(hit, totals.tolist(), DAMAGE_COLOR)
+        positions = positions_of(hit)
+        world.particles.hits(positions)
+
+        dying = np.flatnonzero((hp > 0) & (remaining <= 0))
+        if not len(dying):
+            return []
+        killed = [hit[i] for i in dying.tolist()]
+        for enemy in killed:
+            enemy.release()
+        world.particles.deaths(positions[dying])
+        world.drop_astral_shards(killed)
+        return killed
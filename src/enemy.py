@@ -3,9 +3,11 @@ import json
 import random
 import math
 from settings import *
+from src.animation import Animation, image_clip_set
+from src.bullets import Emitter
+from src.clock import game_clock
 from src.healthbar import HealthBar
-from src.astral_shard import AstralShard
-from src.weapon import Projectile
+from src.scheduler import scheduler
 
 # -------------------------------------------------------------------------
 # Utility Functions
@@ -16,12 +18,21 @@ def load_enemy_data(json_file):
     with open(json_file, "r") as f:
         return json.load(f)
 
+# Enemy types that use the jumping, projectile-firing Demon behaviour
+DEMON_TYPES = {"demon", "magma_demon", "lunar_mage", "astral_warden"}
+
+def create_enemy(enemy_type, x, y, enemy_data, world):
+    """Create an enemy of `enemy_type` with the right class for its behaviour."""
+    enemy_class = Demon if enemy_type in DEMON_TYPES else Enemy
+    enemy = enemy_class(x, y, enemy_data[enemy_type], world)
+    enemy.enemy_type = enemy_type
+    return enemy
+
 def spawn_enemy(enemy_data, world_width, world_height, world):
     """Spawn a random enemy from the available enemy_data."""
     x, y = random.randint(0, world_width), random.randint(0, world_height)
     enemy_type = random.choice(list(enemy_data.keys()))
-    properties = enemy_data[enemy_type]
-    return Enemy(x, y, properties, world)
+    return create_enemy(enemy_type, x, y, enemy_data, world)
 
 # -------------------------------------------------------------------------
 # Base Enemy Class
@@ -30,18 +41,28 @@ def spawn_enemy(enemy_data, world_width, world_height, world):
 class Enemy:
     def __init__(self, x, y, properties, world):
         self.world = world
+        self.enemy_type = None  # key in enemies.json, set by create_enemy()
         self.position = pygame.math.Vector2(x, y)
 
-        # Load and scale the enemy image
+        # Frames are loaded and scaled once per archetype and shared;
+        # "frames" splits the image into a horizontal animation strip
         self.size = properties.get("size", 1)
-        self.image = pygame.image.load(properties["image"]).convert_alpha()
-        original_w, original_h = self.image.get_width(), self.image.get_height()
-        self.image = pygame.transform.scale(
-            self.image,
-            (int(original_w * self.size), int(original_h * self.size))
+        clip_set = image_clip_set(
+            properties["image"], self.size,
+            properties.get("frames", 1), properties.get("animation_fps", 6)
         )
+        self.animation = Animation(clip_set, phase=int(x + y))
+        self.facing_right = True
+
+        self.rect = self.animation.image().get_rect(center=(x, y))
 
-        self.rect = self.image.get_rect(center=(x, y))
+        # Round-robin slot used by the world's update LOD
+        self.lod_bucket = 0
+
+        # How close other enemies may get before being pushed away
+        self.separation_radius = properties.get(
+            "separation_radius", min(self.rect.width, self.rect.height) * 0.375
+        )
 
         # Enemy stats
         self.hp = self.max_hp = properties["hp"]
@@ -57,63 +78,72 @@ class Enemy:
             background_color=(128, 128, 128)
         )
 
-    def move_towards_player(self, player_position):
+    def move_towards_player(self, player_position, steps=1):
         """
         Basic movement that slightly randomizes the angle 
         so enemies don't move in a perfect straight line.
+        `steps` scales the displacement for enemies updated less often.
+        Far from the player the direction comes from the world's shared
+        flow field; inside the player's cell we steer straight at them.
         """
-        direction = player_position - self.position
-        if direction.length() > 0:
+        direction = self.world.flow_field.direction_at(self.position)
+        if direction is None:
+            direction = player_position - self.position
+            if direction.length() == 0:
+                return
             direction = direction.normalize()
-            angle_variation = random.uniform(-5, 5)
-            angle_radians = math.radians(angle_variation)
-            cos_a, sin_a = math.cos(angle_radians), math.sin(angle_radians)
-            rotated_x = direction.x * cos_a - direction.y * sin_a
-            rotated_y = direction.x * sin_a + direction.y * cos_a
 
-            self.position += pygame.math.Vector2(rotated_x, rotated_y).normalize() * self.speed
-            self.rect.center = self.position
+        angle_variation = random.uniform(-5, 5)
+        angle_radians = math.radians(angle_variation)
+        cos_a, sin_a = math.cos(angle_radians), math.sin(angle_radians)
+        rotated_x = direction.x * cos_a - direction.y * sin_a
+        rotated_y = direction.x * sin_a + direction.y * cos_a
+
+        # Rotating a unit vector keeps it unit length, no need to renormalize
+        self.position += pygame.math.Vector2(rotated_x, rotated_y) * (self.speed * steps)
+        self.facing_right = rotated_x >= 0
+        self.rect.center = self.position
 
-    def update(self, player_position, player):
+    def update(self, player_position, player, steps=1):
         """
         Default update: move toward the player.
         (No timer needed for normal enemies.)
         """
-        self.move_towards_player(player_position)
+        self.move_towards_player(player_position, steps)
 
     def draw(self, screen, camera):
         """
         Draw the enemy and its health bar.
         """
         screen_position = camera.apply(self.rect)
-        screen.blit(self.image, screen_position.topleft)
+        screen.blit(self.animation.image(self.facing_right), screen_position.topleft)
 
-        health_bar_position = (screen_position.x, screen_position.y - 10)
-        self.health_bar.draw(screen, health_bar_position, self.hp, self.max_hp)
+        if self.world.show_enemy_health_bars:
+            health_bar_position = (screen_position.x, screen_position.y - 10)
+            self.health_bar.draw(screen, health_bar_position, self.hp, self.max_hp)
+
+    def mask(self):
+        """Pixel mask of the frame being shown, lined up with self.rect."""
+        return self.animation.mask(self.facing_right)
 
     def take_damage(self, damage):
         self.hp -= damage
-        self.world.add_floating_text(
-            text=str(damage),
-            target=self,
-            offset=(0, -20),
-            color=(255, 0, 0)
-        )
+        self.world.add_damage_number(damage, self, (255, 0, 0))
+        self.world.particles.hit(self.position)
         if self.hp <= 0:
             self.die()
 
     def die(self):
+        self.release()
+        self.world.particles.death(self.position)
         self.drop_astral_shard()
 
+    def release(self):
+        """Let go of anything that would outlive the enemy, e.g. scheduled events."""
+
     def drop_astral_shard(self):
         """Drop astral shards around the enemy's position."""
-        for _ in range(self.astral_shards_drop):
-            offset_x = random.randint(-20, 20)
-            offset_y = random.randint(-20, 20)
-            shard_x = max(0, min(self.position.x + offset_x, self.world.width))
-            shard_y = max(0, min(self.position.y + offset_y, self.world.height))
-            shard = AstralShard(shard_x, shard_y)
-            self.world.add_astral_shard(shard)
+        self.world.drop_astral_shards([self])
 
 # -------------------------------------------------------------------------
 # Demon Subclass
@@ -129,36 +159,63 @@ class Demon(Enemy):
 
         # Firing-related properties
         self.fire_rate = properties.get("shoot_cooldown", 2)      # seconds
-        self.projectile_speed = properties.get("projectile_speed", 7)
-        self.range = properties.get("projectile_range", 300)
         self.damage = properties.get("damage", 50)
-        self.projectiles_per_circle = properties.get("projectiles_per_circle", 12)
 
-        # Track last time demon fired (in seconds)
-        self.last_shot_time = 0.0
-        self.projectiles = []
+        # Bullet patterns (see src/bullets.py); a plain ring by default
+        emitters = properties.get("emitters") or [
+            {"pattern": "ring", "count": properties.get("projectiles_per_circle", 12)}
+        ]
+        self.emitters = [
+            Emitter(
+                config, world.bullets, properties.get("projectile_speed", 7),
+                properties.get("projectile_range", 300), self.damage,
+            )
+            for config in emitters
+        ]
 
         # Jump-related timing
         self.jump_cooldown = 20        # Jump every 20 seconds
-        self.rise_time = 0.2            # 1 second rising
+        self.rise_time = 0.2            # seconds rising
         self.disappear_time = 2.0       # 2 seconds invisible
         # total time in air = self.rise_time + self.disappear_time
 
-        # Jump states: "idle", "rising", "disappeared", "reappearing"
+        # Jump states: "idle", "rising", "disappeared"
         self.jump_state = "idle"
-        self.jump_start_time = 0.0
 
         # Where demon will appear after the jump
         self.reappear_position = None
 
-        # Track when the last jump finished
-        self.last_jump_finish_time = 0.0
+        # Scheduler events for the next jump phase change and the next shot
+        self.jump_event = None
+        self.fire_event = None
 
-        # Load/scale the projectile image
-        original_image = pygame.image.load("assets/images/projectiles/Fireball1.png").convert_alpha()
-        scale_factor = 10
-        w, h = original_image.get_width(), original_image.get_height()
-        self.projectile_image = pygame.transform.scale(original_image, (w * scale_factor, h * scale_factor))
+        # Ready to fire straight away; first jump one cooldown after spawning
+        now = game_clock.game_time
+        self.schedule(jump_at=now + self.jump_cooldown, fire_at=now)
+
+    # -------------------------
+    # Scheduled events
+    # -------------------------
+    def schedule(self, jump_at, fire_at=None):
+        """
+        Register the next jump phase change at `jump_at` and, if given, the
+        next shot at `fire_at` (game-clock seconds), replacing pending ones.
+        """
+        self.cancel_events()
+        self.jump_event = scheduler.call_at(jump_at, self.advance_jump)
+        if fire_at is not None:
+            self.fire_event = scheduler.call_at(fire_at, self.fire)
+
+    def cancel_events(self):
+        for event in (self.jump_event, self.fire_event):
+            if event:
+                event.cancel()
+        self.jump_event = self.fire_event = None
+        self.cancel_volleys()
+
+    def cancel_volleys(self):
+        for emitter in self.emitters:
+            emitter.cancel()
 
     # -------------------------
     # Jump Logic
@@ -166,10 +223,9 @@ class Demon(Enemy):
     def is_jumping(self):
         return self.jump_state != "idle"
 
-    def start_jump(self, player_position, timer):
+    def start_jump(self, player_position):
         """Begin the jump sequence."""
         self.jump_state = "rising"
-        self.jump_start_time = timer.get_time()
 
         # Random offset so the demon doesn't appear exactly on top of the player
         offset_x = random.randint(-50, 50)
@@ -180,115 +236,70 @@ class Demon(Enemy):
         new_y = max(0, min(self.world.height, player_position.y + offset_y))
         self.reappear_position = pygame.math.Vector2(new_x, new_y)
 
-    def update_jump(self, timer):
+    def advance_jump(self):
         """
-        Manage the demon's jump states:
-          - "rising": move visually upward for self.rise_time
-          - "disappeared": remain invisible for self.disappear_time
-          - "reappearing": instantly teleport + fire
+        Runs when the current jump phase is over:
+          - "idle": the cooldown is up, start rising (no firing mid-jump)
+          - "rising": the demon has risen for self.rise_time, go invisible
+          - "disappeared": after self.disappear_time, teleport near the
+            player, fire immediately and start the next cooldown
         """
-        elapsed = timer.get_time() - self.jump_start_time
-
-        if self.jump_state == "rising":
-            # Move up for self.rise_time seconds
-            if elapsed < self.rise_time:
-                self.position.y -= 2
-                self.rect.center = self.position
-            else:
-                # Switch to invisible
-                self.jump_state = "disappeared"
-                self.jump_start_time = timer.get_time()  # reset for the next phase
+        now = game_clock.game_time
+        if self.jump_state == "idle":
+            self.start_jump(self.world.player.position)
+            if self.fire_event:
+                self.fire_event.cancel()
+                self.fire_event = None
+            self.cancel_volleys()
+            self.jump_event = scheduler.call_at(now + self.rise_time, self.advance_jump)
+
+        elif self.jump_state == "rising":
+            self.jump_state = "disappeared"
+            self.jump_event = scheduler.call_at(now + self.disappear_time, self.advance_jump)
 
         elif self.jump_state == "disappeared":
-            if elapsed < self.disappear_time:
-                # Stay invisible
-                pass
-            else:
-                # Reappear near the player
-                self.jump_state = "reappearing"
-                self.position = self.reappear_position
-                self.rect.center = self.position
-
-                # Fire immediately
-                self.fire_projectiles(timer)
-
-        elif self.jump_state == "reappearing":
-            # Jump done
             self.jump_state = "idle"
-            self.last_jump_finish_time = timer.get_time()
+            self.position = self.reappear_position
+            self.rect.center = self.position
+            self.fire_projectiles()
+            self.schedule(jump_at=now + self.jump_cooldown, fire_at=now + self.fire_rate)
 
     # -------------------------
     # Firing Logic
     # -------------------------
-    def can_fire(self, timer):
-        """
-        Demon can fire if:
-          - It's not jumping
-          - Enough time has passed since the last shot
-        """
-        if self.is_jumping():
-            return False
-
-        current_time = timer.get_time()
-        return (current_time - self.last_shot_time) >= self.fire_rate
+    def fire(self):
+        self.fire_projectiles()
+        self.fire_event = scheduler.call_later(self.fire_rate, self.fire)
 
-    def fire_projectiles(self, timer):
-        """Fire a circle of projectiles around the demon."""
-        self.last_shot_time = timer.get_time()
-        angle_step = 360 / self.projectiles_per_circle
-
-        for i in range(self.projectiles_per_circle):
-            angle = math.radians(i * angle_step)
-            direction = pygame.math.Vector2(math.cos(angle), math.sin(angle))
-            direction = direction.normalize()
-
-            projectile_target = self.position + direction * self.range
-            projectile = Projectile(
-                self.position,
-                projectile_target,
-                self.projectile_speed,
-                self.damage,
-                self.range,
-                self.projectile_image
-            )
-            self.projectiles.append(projectile)
+    def fire_projectiles(self):
+        """Fire every emitter's pattern into the world's bullets."""
+        for emitter in self.emitters:
+            emitter.fire(self)
 
     # -------------------------
     # Update & Draw Overrides
     # -------------------------
-    def update(self, player_position, player, timer):
+    def update(self, player_position, player, steps=1):
         """
-        Demon update requires passing in `timer` for time-based actions.
+        Jumps and shots are driven by the scheduler and the bullets live in
+        the world; this only moves the demon (rising, or normal movement
+        scaled by `steps`).
         """
-        # Possibly start a jump if we're idle
-        time_since_jump = timer.get_time() - self.last_jump_finish_time
-        if self.jump_state == "idle" and time_since_jump >= self.jump_cooldown:
-            self.start_jump(player_position, timer)
-
-        # Handle jump states or normal movement/fire
-        if self.is_jumping():
-            self.update_jump(timer)
-        else:
-            # Normal movement from Enemy
-            super().update(player_position, player)
-            # Fire if cooldown allows
-            if self.can_fire(timer):
-                self.fire_projectiles(timer)
-
-        # Update existing projectiles
-        self.projectiles = [p for p in self.projectiles if p.update([player])]
+        if self.jump_state == "rising":
+            # Move visually upward while rising
+            self.position.y -= 2
+            self.rect.center = self.position
+        elif not self.is_jumping() and steps:
+            super().update(player_position, player, steps)
+
+    def release(self):
+        self.cancel_events()
 
     def draw(self, screen, camera):
-        """
-        Don't draw the demon if in 'disappeared' state. 
-        Always draw projectiles.
-        """
+        """Don't draw the demon if in 'disappeared' state."""
         if self.jump_state != "disappeared":
             super().draw(screen, camera)
 
-        for projectile in self.projectiles:
-            projectile.draw(screen, camera)
-
 # -------------------------------------------------------------------------
 # EnemyManager
 # -------------------------------------------------------------------------
@@ -312,15 +323,9 @@ class EnemyManager:
             ))
 
     def update(self, player, timer):
-        """
-        Update all enemies. If an enemy is a Demon, call its update with `timer`.
-        Other enemies get a normal update without the timer parameter.
-        """
+        """Update all enemies (demon timers run on the scheduler)."""
         for enemy in self.enemies:
-            if isinstance(enemy, Demon):
-                enemy.update(player.position, player, timer)
-            else:
-                enemy.update(player.position, player)
+            enemy.update(player.position, player)
 
             # Check collision with player
             if enemy.rect.colliderect(player.rect):
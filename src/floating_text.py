@@ -1,5 +1,27 @@
+import math
 import pygame
 import random
+from src.clock import game_clock
+
+FONT_PATH = "assets/fonts/dogicabold.ttf"
+# Fading is done in this many alpha steps, so a text's alpha only changes a
+# handful of times over its lifetime instead of every frame
+ALPHA_STEPS = 8
+ALPHA_LEVELS = [int(255 * step / ALPHA_STEPS) for step in range(ALPHA_STEPS + 1)]
+
+_fonts = {}
+
+
+def get_font(size=16):
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = pygame.font.Font(FONT_PATH, size)
+    return font
+
+
+def format_amount(amount):
+    return f"{amount:g}"
+
 
 class FloatingText:
     def __init__(self, text, target, offset, color, duration=1, font=None):
@@ -8,27 +30,128 @@ class FloatingText:
         self.offset = pygame.math.Vector2(offset)
         self.color = color
         self.duration = duration
-        self.start_time = pygame.time.get_ticks() / 1000
-        self.font = pygame.font.Font("assets/fonts/dogicabold.ttf", 16)
+        self.start_time = game_clock.game_time
+        self.font = font or get_font()
         self.random_movement = pygame.math.Vector2(
             random.uniform(-0.5, 0.5),
             random.uniform(-0.2, -0.5)
         )
+        # Numbers that later hits can be added to (see FloatingTextManager)
+        self.amount = None
+        self.merge_until = self.start_time
+        # Rendered once per text change, not per frame; each fade step gets
+        # its own copy so a surface is never changed after it was drawn
+        self.rendered = None
+        self.surface = None
+        self.alpha_step = None
+
+    def set_text(self, text):
+        self.text = text
+        self.rendered = None
+
+    def add(self, amount):
+        """Merge another hit into this number and restart its fade."""
+        self.amount += amount
+        self.set_text(format_amount(self.amount))
+        self.start_time = game_clock.game_time
 
     def update(self):
-        current_time = pygame.time.get_ticks() / 1000
+        current_time = game_clock.game_time
         elapsed_time = current_time - self.start_time
         self.offset += self.random_movement
         return elapsed_time >= self.duration
 
     def draw(self, screen, camera=None):
         position = pygame.math.Vector2(self.target.position) + self.offset if self.target else self.offset
-        current_time = pygame.time.get_ticks() / 1000
-        elapsed_time = current_time - self.start_time
-        alpha = max(0, int(255 * (1 - elapsed_time / self.duration)))
-        text_surface = self.font.render(self.text, True, self.color)
-        text_surface.set_alpha(alpha)
-        text_rect = text_surface.get_rect(center=position)
+        elapsed_time = game_clock.game_time - self.start_time
+        alpha_step = max(0, min(ALPHA_STEPS, math.ceil(ALPHA_STEPS * (1 - elapsed_time / self.duration))))
+        if self.rendered is None:
+            self.rendered = self.font.render(self.text, True, self.color)
+            self.alpha_step = None
+        if alpha_step != self.alpha_step:
+            self.alpha_step = alpha_step
+            self.surface = self.rendered.copy()
+            self.surface.set_alpha(ALPHA_LEVELS[alpha_step])
+        text_rect = self.surface.get_rect(center=position)
         if camera:
             text_rect.topleft -= camera.offset
-        screen.blit(text_surface, text_rect.topleft)
+        screen.blit(self.surface, text_rect.topleft)
+
+
+class FloatingTextManager:
+    """
+    All live floating texts. Numbers shown on the same target in the same
+    color within `merge_window` seconds of the first one are summed into one
+    text, and at most `limit` texts exist at once; past that the oldest is
+    dropped, so the cost stays bounded however many hits land.
+    """
+
+    def __init__(self, limit, merge_window):
+        self.limit = limit
+        self.merge_window = merge_window
+        self.enabled = True
+        self.texts = []
+        # (target, color) -> number that is still accepting hits
+        self.open_numbers = {}
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __iter__(self):
+        return iter(self.texts)
+
+    def set_enabled(self, enabled):
+        """Turn floating texts on or off (off also drops the live ones)."""
+        self.enabled = enabled
+        if not enabled:
+            self.clear()
+
+    def add(self, floating_text):
+        if not self.enabled:
+            return None
+        if len(self.texts) >= self.limit:
+            oldest = self.texts.pop(0)
+            oldest.merge_until = float("-inf")  # an evicted number takes no more hits
+        self.texts.append(floating_text)
+        return floating_text
+
+    def add_number(self, amount, target, offset, color, duration):
+        if not self.enabled:
+            return None
+        key = (target, color)
+        text = self.open_numbers.get(key)
+        now = game_clock.game_time
+        if text is not None and now <= text.merge_until:
+            text.add(amount)
+            return text
+        text = FloatingText(format_amount(amount), target, offset, color, duration)
+        text.amount = amount
+        text.merge_until = now + self.merge_window
+        self.open_numbers[key] = text
+        return self.add(text)
+
+    def add_numbers(self, amounts, targets, offset, color, duration):
+        """add_number() for many targets at once."""
+        if not self.enabled:
+            return
+        # New numbers past the limit would only evict each other; amounts
+        # still merge into numbers that are already showing
+        fresh = self.limit
+        now = game_clock.game_time
+        for amount, target in zip(amounts, targets):
+            text = self.open_numbers.get((target, color))
+            if text is not None and now <= text.merge_until:
+                text.add(amount)
+            elif fresh:
+                fresh -= 1
+                self.add_number(amount, target, offset, color, duration)
+
+    def update(self):
+        self.texts = [text for text in self.texts if not text.update()]
+        now = game_clock.game_time
+        if self.open_numbers:
+            self.open_numbers = {key: text for key, text in self.open_numbers.items() if text.merge_until >= now}
+
+    def clear(self):
+        self.texts = []
+        self.open_numbers = {}
@@ -0,0 +1,115 @@
+import math
+from collections import deque
+
+import pygame
+
+
+class FlowField:
+    """
+    Coarse grid of directions toward the player, shared by every chasing enemy.
+
+    Each cell stores a unit vector toward the next cell on a shortest path to the
+    player's cell (BFS over 8 neighbours, no corner cutting past blocked cells).
+    The field is rebuilt only when the player changes cells or obstacles change,
+    so enemies just do an O(1) lookup per tick.
+    """
+    NEIGHBORS = [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
+
+    def __init__(self, world_width, world_height, cell_size):
+        self.cell_size = cell_size
+        self.cols = math.ceil(world_width / cell_size)
+        self.rows = math.ceil(world_height / cell_size)
+        self.blocked = bytearray(self.cols * self.rows)
+        self.directions = [None] * (self.cols * self.rows)
+        self.adjacency = None
+        self.target_cell = None
+        self.dirty = True
+
+        # One shared vector per neighbour direction; cells point at these.
+        # Each cell steps *back* toward the neighbour it was reached from.
+        self.step_vectors = [pygame.math.Vector2(-dx, -dy).normalize() for dx, dy in self.NEIGHBORS]
+
+    def cell_index(self, position):
+        col = min(max(int(position[0] // self.cell_size), 0), self.cols - 1)
+        row = min(max(int(position[1] // self.cell_size), 0), self.rows - 1)
+        return row * self.cols + col
+
+    def _cells_in_rect(self, rect):
+        first_col = max(rect.left // self.cell_size, 0)
+        last_col = min((rect.right - 1) // self.cell_size, self.cols - 1)
+        first_row = max(rect.top // self.cell_size, 0)
+        last_row = min((rect.bottom - 1) // self.cell_size, self.rows - 1)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                yield row * self.cols + col
+
+    def add_obstacle(self, rect):
+        """Block every cell overlapped by `rect` (world coordinates)."""
+        for index in self._cells_in_rect(rect):
+            self.blocked[index] = 1
+        self.adjacency = None
+        self.dirty = True
+
+    def clear_obstacles(self):
+        self.blocked = bytearray(self.cols * self.rows)
+        self.adjacency = None
+        self.dirty = True
+
+    def update(self, target_position):
+        """Rebuild the field if the target moved to another cell or obstacles changed."""
+        target_cell = self.cell_index(target_position)
+        if self.dirty or target_cell != self.target_cell:
+            self.target_cell = target_cell
+            self.rebuild()
+            self.dirty = False
+
+    def build_adjacency(self):
+        """
+        Precompute, per cell, the walkable neighbours and the vector leading
+        back from each of them. Only changes when obstacles do.
+        """
+        cols, rows = self.cols, self.rows
+        blocked = self.blocked
+        adjacency = []
+        for index in range(cols * rows):
+            row, col = divmod(index, cols)
+            moves = []
+            for n, (dx, dy) in enumerate(self.NEIGHBORS):
+                ncol, nrow = col + dx, row + dy
+                if not (0 <= ncol < cols and 0 <= nrow < rows):
+                    continue
+                neighbor = nrow * cols + ncol
+                if blocked[neighbor]:
+                    continue
+                # Don't let diagonal moves squeeze between two blocked cells
+                if dx and dy and (blocked[row * cols + ncol] or blocked[nrow * cols + col]):
+                    continue
+                moves.append((neighbor, self.step_vectors[n]))
+            adjacency.append(moves)
+        self.adjacency = adjacency
+
+    def rebuild(self):
+        if self.adjacency is None:
+            self.build_adjacency()
+        adjacency = self.adjacency
+        directions = [None] * (self.cols * self.rows)
+        visited = bytearray(self.blocked)
+
+        start = self.target_cell
+        visited[start] = 1
+        queue = deque([start])
+        pop, push = queue.popleft, queue.append
+        while queue:
+            for neighbor, step in adjacency[pop()]:
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    directions[neighbor] = step
+                    push(neighbor)
+        self.directions = directions
+
+    def direction_at(self, position):
+        """
+        Unit vector to follow from `position`, or None inside the target cell
+        (and in unreachable cells), where callers should steer directly.
+        """
+        return self.directions[self.cell_index(position)]
@@ -0,0 +1,195 @@
+"""
+Frame-time histograms per wave, for spotting stutter that averages hide.
+
+Every frame's duration and its per-stage split go into log-linear (HDR
+style) histograms: values are kept in microseconds, exact below
+SUB_BUCKETS and with under 1% relative error above it. Memory is fixed
+however many frames are recorded. There is one set of histograms per wave
+(from WaveManager.current_wave, "none" between waves).
+
+Exports are a CSV and a JSON file of percentiles per wave and metric. The
+JSON one doubles as a baseline for regression checks:
+
+    python -m src.frame_times compare baseline.json frame_times.json --threshold 0.1
+
+exits with status 1 when any wave's frame p99 is more than `threshold`
+(fractionally) above the baseline's, or when a baseline wave or the metric
+is missing from the current export (a run that ended early fails too).
+"""
+import argparse
+import csv
+import json
+import sys
+
+SUB_BUCKET_BITS = 8
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_BUCKETS = SUB_BUCKETS // 2
+MAX_MICROSECONDS = 60 * 10**6  # longer frames are clamped
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def bucket_index(value):
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return SUB_BUCKETS + (shift - 1) * HALF_BUCKETS + (value >> shift) - HALF_BUCKETS
+
+
+def bucket_value(index):
+    """Midpoint of the values that land in bucket `index`."""
+    if index < SUB_BUCKETS:
+        return index
+    shift, offset = divmod(index - SUB_BUCKETS, HALF_BUCKETS)
+    shift += 1
+    return ((offset + HALF_BUCKETS) << shift) + (1 << (shift - 1))
+
+
+BUCKET_COUNT = bucket_index(MAX_MICROSECONDS) + 1
+
+
+class FrameHistogram:
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        value = min(int(ms * 1000), MAX_MICROSECONDS)
+        self.counts[bucket_index(value)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, percent):
+        if not self.count:
+            return 0.0
+        rank = max(1, round(self.count * percent / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bucket_value(index) / 1000, self.max_ms)
+        return self.max_ms
+
+    def summary(self):
+        summary = {"count": self.count, "mean": self.total_ms / self.count if self.count else 0.0}
+        for percent in PERCENTILES:
+            summary[f"p{percent:g}"] = self.percentile(percent)
+        summary["max"] = self.max_ms
+        return summary
+
+
+class FrameTimeRecorder:
+    """Histograms of frame and stage times, keyed by wave and then metric."""
+
+    def __init__(self):
+        self.waves = {}
+
+    def record(self, wave, frame_ms, stage_times):
+        metrics = self.waves.get(wave)
+        if metrics is None:
+            metrics = self.waves[wave] = {"frame": FrameHistogram()}
+        metrics["frame"].record(frame_ms)
+        for name, ms in stage_times.items():
+            histogram = metrics.get(name)
+            if histogram is None:
+                histogram = metrics[name] = FrameHistogram()
+            histogram.record(ms)
+
+    def record_game(self, game, frame_ms):
+        current_wave = game.wave_manager.current_wave
+        self.record(current_wave["wave_number"] if current_wave else "none", frame_ms, game.stage_times)
+
+    def merge(self, other):
+        for wave, metrics in other.waves.items():
+            own = self.waves.setdefault(wave, {})
+            for name, histogram in metrics.items():
+                own.setdefault(name, FrameHistogram()).merge(histogram)
+
+    def summary(self):
+        """{wave: {metric: percentiles}} with waves in play order."""
+        ordered = sorted(self.waves, key=lambda wave: (wave == "none", 0 if wave == "none" else wave))
+        return {
+            str(wave): {name: histogram.summary() for name, histogram in self.waves[wave].items()}
+            for wave in ordered
+        }
+
+    def export(self, path):
+        """Write `path`.json and `path`.csv."""
+        summary = self.summary()
+        with open(path + ".json", "w") as f:
+            json.dump({"waves": summary}, f, indent=2)
+        with open(path + ".csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            columns = ["count", "mean"] + [f"p{percent:g}" for percent in PERCENTILES] + ["max"]
+            writer.writerow(["wave", "metric"] + columns)
+            for wave, metrics in summary.items():
+                for name, values in metrics.items():
+                    writer.writerow([wave, name] + [
+                        values[column] if column == "count" else f"{values[column]:.3f}" for column in columns
+                    ])
+        print(f"Frame times written to {path}.json and {path}.csv.")
+
+
+def compare(baseline, current, threshold, metric="frame", percentile="p99"):
+    """
+    (report lines, regressed) for `percentile` of `metric` in every wave of
+    the baseline. Waves or metrics the current summary lacks count as
+    regressions, and so does having nothing to compare.
+    """
+    lines = []
+    regressed = False
+    compared = 0
+    for wave, baseline_metrics in baseline["waves"].items():
+        if metric not in baseline_metrics:
+            continue
+        metrics = current["waves"].get(wave)
+        if metrics is None or metric not in metrics:
+            regressed = True
+            lines.append(f"wave {wave:>4}: {metric} missing from the current run  REGRESSION")
+            continue
+        compared += 1
+        before = baseline_metrics[metric][percentile]
+        after = metrics[metric][percentile]
+        change = (after - before) / before if before else 0.0
+        failed = change > threshold
+        regressed |= failed
+        lines.append(
+            f"wave {wave:>4}: {percentile} {before:7.2f} -> {after:7.2f} ms ({change:+.1%})"
+            + ("  REGRESSION" if failed else "")
+        )
+    if not compared:
+        regressed = True
+        lines.append(f"No waves with '{metric}' to compare.  REGRESSION")
+    return lines, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Frame-time histogram tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compare_parser = commands.add_parser("compare", help="fail if any wave's p99 regressed against a baseline")
+    compare_parser.add_argument("baseline", help="JSON export to compare against")
+    compare_parser.add_argument("current", help="JSON export of the run being checked")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="allowed fractional increase")
+    compare_parser.add_argument("--metric", default="frame", help="'frame' or a stage name")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    lines, regressed = compare(baseline, current, args.threshold, args.metric)
+    print("\n".join(lines))
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import os
+import random
+import time
+from collections import defaultdict
+
+import pygame
+import settings
+from game import Game
+from src.clock import game_clock
+from src.game_state_manager import GameStateManager
+from src.timer import Timer
+from src.frame_times import FrameTimeRecorder
+from src import telemetry
+
+
+def init_headless_display():
+    """Set up pygame without a visible window (images still need a display to convert)."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    # SDL turns SIGTERM into a quit event by default, which keeps
+    # multiprocessing from terminating pool workers
+    os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+
+class HeadlessGame(Game):
+    """
+    The gameplay loop without a window or real input: a bot policy drives the
+    player and time advances by a fixed step per tick, so a run only depends
+    on its seed and config.
+    """
+    autosave = False
+
+    def __init__(self, config_dir=Game.config_dir, screen_size=(1920, 1080)):
+        self.config_dir = config_dir
+        telemetry.start_tracing()
+        settings.WIDTH, settings.HEIGHT = screen_size
+        self.running = True
+        game_clock.use_fixed_step()
+        self.timer = Timer()
+        self.state_manager = GameStateManager()
+        self.font = pygame.font.Font("assets/fonts/dogicapixel.ttf", 16)
+
+        self.initialize_game_objects(*screen_size)
+        self.timer.start()
+
+    def config_path(self, file_name):
+        """Config variants only need to contain the files they change."""
+        path = os.path.join(self.config_dir, file_name)
+        if os.path.exists(path):
+            return path
+        return os.path.join(Game.config_dir, file_name)
+
+    def step(self, policy):
+        """Advance the simulation by one tick with input from `policy`."""
+        keys, aim = policy(self)
+        self.player.update(keys)
+        if aim is not None:
+            self.weapon_manager.fire_weapon(self.player.position, aim)
+        self.update()
+        game_clock.advance(1000 / settings.FPS)
+
+
+# -------------------------------------------------------------------------
+# Bot policies: take the game, return (pressed keys, aim position or None)
+# -------------------------------------------------------------------------
+
+def nearest_enemy(game):
+    nearest = game.world.nearest_enemies(game.player.position)
+    return nearest[0] if nearest else None
+
+
+def aim_at_nearest(game):
+    enemy = nearest_enemy(game)
+    if enemy is None or enemy.position == game.player.position:
+        return None
+    return pygame.math.Vector2(enemy.position)
+
+
+def idle_policy(game):
+    """Stand still and shoot the closest enemy."""
+    return defaultdict(bool), aim_at_nearest(game)
+
+
+def kite_policy(game, keep_away=300):
+    """Back away from the closest enemy once it gets within `keep_away` pixels."""
+    keys = defaultdict(bool)
+    enemy = nearest_enemy(game)
+    if enemy is None:
+        return keys, None
+    away = game.player.position - enemy.position
+    if 0 < away.length() < keep_away:
+        keys[pygame.K_d] = away.x > 0
+        keys[pygame.K_a] = away.x < 0
+        keys[pygame.K_s] = away.y > 0
+        keys[pygame.K_w] = away.y < 0
+    return keys, aim_at_nearest(game)
+
+
+def circle_policy(game, period_seconds=8):
+    """Run in a loop (changing direction every quarter period) while shooting."""
+    keys = defaultdict(bool)
+    quarter = int(game.timer.get_time() * 4 / period_seconds) % 4
+    keys[(pygame.K_d, pygame.K_s, pygame.K_a, pygame.K_w)[quarter]] = True
+    return keys, aim_at_nearest(game)
+
+
+POLICIES = {
+    "idle": idle_policy,
+    "kite": kite_policy,
+    "circle": circle_policy,
+}
+
+
+# -------------------------------------------------------------------------
+# Single run
+# -------------------------------------------------------------------------
+
+def run_simulation(seed, config_dir=Game.config_dir, policy_name="kite", max_seconds=1200, telemetry_path=None,
+                   record_frame_times=False):
+    """
+    Play one full run and return per-wave results: whether the player survived
+    it, whether it was cleared (every enemy killed before the wave timed
+    out) and how long it took, shards earned and simulation cost per tick.
+    With `telemetry_path`, the memory telemetry at the end of the run is
+    written there. With `record_frame_times`, the result also holds the run's
+    FrameTimeRecorder under "frame_times".
+    """
+    random.seed(seed)
+    game = HeadlessGame(config_dir)
+    policy = POLICIES[policy_name]
+    player, wave_manager = game.player, game.wave_manager
+
+    waves = []
+    wave_index = wave_manager.wave_index
+    wave_start_time = game.timer.get_time()
+    wave_start_shards = player.astral_shards
+    frame_times = []
+    recorder = FrameTimeRecorder() if record_frame_times else None
+
+    def close_wave(survived, cleared):
+        frame_times.sort()
+        waves.append({
+            "wave": wave_manager.waves[wave_index]["wave_number"],
+            "survived": survived,
+            "cleared": cleared,
+            "time": game.timer.get_time() - wave_start_time,
+            "shards_earned": player.astral_shards - wave_start_shards,
+            "ticks": len(frame_times),
+            "frame_ms_mean": sum(frame_times) / len(frame_times) if frame_times else 0.0,
+            "frame_ms_p95": frame_times[int(len(frame_times) * 0.95)] if frame_times else 0.0,
+            "frame_ms_max": frame_times[-1] if frame_times else 0.0,
+        })
+
+    for _ in range(int(max_seconds * settings.FPS)):
+        start = time.perf_counter()
+        game.step(policy)
+        frame_ms = (time.perf_counter() - start) * 1000
+        frame_times.append(frame_ms)
+        if recorder:
+            recorder.record_game(game, frame_ms)
+
+        if player.hp <= 0:
+            close_wave(survived=False, cleared=False)
+            break
+        if wave_manager.wave_index != wave_index:
+            close_wave(survived=True, cleared=wave_manager.last_wave_cleared)
+            if wave_manager.current_wave is None:
+                break
+            wave_index = wave_manager.wave_index
+            wave_start_time = game.timer.get_time()
+            wave_start_shards = player.astral_shards
+            frame_times = []
+    else:
+        close_wave(survived=True, cleared=False)
+
+    if telemetry_path:
+        telemetry.dump(game, telemetry_path)
+    result = {
+        "seed": seed,
+        "variant": config_dir,
+        "policy": policy_name,
+        "died": player.hp <= 0,
+        "waves": waves,
+    }
+    if recorder:
+        result["frame_times"] = recorder
+    return result
@@ -0,0 +1,88 @@
+"""
+Decoded images cached on disk.
+
+PNG decoding dominates asset loading. load_image() keeps the raw RGBA pixels
+of every image it decodes under settings.ASSET_CACHE_DIR, tagged with the
+source file's mtime and size, and later loads read those bytes back instead
+of decoding the PNG again. Editing or replacing a source image changes its
+mtime, so its cache entry is simply rewritten on the next load.
+"""
+import os
+import struct
+import time
+
+import pygame
+import settings
+
+# mtime_ns, source size, width, height
+HEADER = struct.Struct("<qqII")
+
+# (path, seconds, cached) for every load_image call since the last report
+load_times = []
+
+
+def cache_path(path):
+    name = os.path.normpath(path).replace(os.sep, "_").replace(":", "_")
+    return os.path.join(settings.ASSET_CACHE_DIR, name + ".rgba")
+
+
+def read_cached(path, source_stat):
+    try:
+        with open(cache_path(path), "rb") as cache_file:
+            data = cache_file.read()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    mtime_ns, size, width, height = HEADER.unpack_from(data)
+    if (mtime_ns, size) != (source_stat.st_mtime_ns, source_stat.st_size):
+        return None
+    pixels = data[HEADER.size:]
+    if len(pixels) != width * height * 4:
+        return None
+    return pygame.image.frombytes(pixels, (width, height), "RGBA")
+
+
+def write_cached(path, source_stat, image):
+    target = cache_path(path)
+    temporary = target + ".tmp"
+    try:
+        os.makedirs(settings.ASSET_CACHE_DIR, exist_ok=True)
+        with open(temporary, "wb") as cache_file:
+            cache_file.write(HEADER.pack(source_stat.st_mtime_ns, source_stat.st_size, *image.get_size()))
+            cache_file.write(pygame.image.tobytes(image, "RGBA"))
+        os.replace(temporary, target)
+    except OSError as error:
+        # A read-only install still runs, it just decodes every time
+        print(f"Could not cache {path}: {error}")
+
+
+def load_image(path):
+    """pygame.image.load(path).convert_alpha(), through the on-disk cache."""
+    start = time.perf_counter()
+    source_stat = os.stat(path)
+    image = read_cached(path, source_stat) if settings.ASSET_CACHE_ENABLED else None
+    cached = image is not None
+    if not cached:
+        image = pygame.image.load(path)
+        if settings.ASSET_CACHE_ENABLED:
+            write_cached(path, source_stat, image)
+    image = image.convert_alpha()
+    load_times.append((path, time.perf_counter() - start, cached))
+    return image
+
+
+def report_load_times():
+    """
+    Print how long the images loaded since the last report took, then forget
+    them. Each image is listed only with settings.ASSET_LOAD_TIMES_DEBUG.
+    """
+    if not load_times:
+        return
+    total = sum(seconds for _, seconds, _ in load_times)
+    cached = sum(1 for _, _, was_cached in load_times if was_cached)
+    print(f"Loaded {len(load_times)} images in {total * 1000:.1f} ms ({cached} from cache)")
+    if settings.ASSET_LOAD_TIMES_DEBUG:
+        for path, seconds, was_cached in load_times:
+            print(f"  {seconds * 1000:6.2f} ms  {'cache' if was_cached else 'png  '}  {path}")
+    load_times.clear()
@@ -21,11 +21,10 @@ class Inventory:
         if 0 <= slot < len(self.consumables):
             consumable = self.consumables[slot]
             if consumable and not consumable.is_active:
-                consumable.apply_effect(player)
+                consumable.apply_effect(player, on_expire=self.remove_consumable)
 
-    def update_consumables(self):
-        for i, consumable in enumerate(self.consumables):
-            if consumable:
-                consumable.update()
-                if consumable.is_used and consumable.get_time_remaining() == 0:
-                    self.consumables[i] = None
+    def remove_consumable(self, consumable):
+        """Free the slot of a used-up consumable."""
+        for i, slot in enumerate(self.consumables):
+            if slot is consumable:
+                self.consumables[i] = None
@@ -0,0 +1,105 @@
+"""
+Minimap in the corner of the HUD.
+
+The terrain is drawn once at minimap size. Enemies and astral shards are
+binned into a coarse density grid with np.histogram2d every
+MINIMAP_UPDATE_INTERVAL ticks and turned into a small heatmap, which is
+composited over the terrain into a single surface. Drawing is one blit plus
+the player marker and the camera view, no matter how many entities exist.
+"""
+from itertools import chain
+
+import numpy as np
+import pygame
+
+ENEMY_COLOR = (255, 40, 40)
+SHARD_COLOR = (90, 200, 255)
+OBSTACLE_COLOR = (60, 50, 40)
+BORDER_COLOR = (255, 255, 255)
+PLAYER_COLOR = (255, 255, 255)
+VIEW_COLOR = (255, 255, 0)
+
+
+def entity_positions(entities):
+    count = len(entities)
+    return np.fromiter(
+        chain.from_iterable(entity.position for entity in entities), float, 2 * count
+    ).reshape(count, 2)
+
+
+class Minimap:
+    def __init__(self, world, size, grid_size, update_interval, saturation):
+        self.world = world
+        self.size = size
+        self.grid_size = grid_size
+        self.update_interval = update_interval
+        self.saturation = saturation  # entities per cell drawn at full strength
+        self.scale = (size / world.width, size / world.height)
+        self.bins = (np.linspace(0, world.width, grid_size + 1), np.linspace(0, world.height, grid_size + 1))
+        self.terrain = None
+        self.surface = None
+        self.last_update_tick = None
+
+    def reset(self):
+        """Redraw the heatmap on the next update."""
+        self.last_update_tick = None
+
+    def build_terrain(self):
+        """The tiled background reduced to its average color, plus obstacles."""
+        world = self.world
+        self.terrain = pygame.Surface((self.size, self.size))
+        self.terrain.fill(pygame.transform.average_color(world.tile_sprite)[:3])
+        for obstacle in world.obstacles:
+            pygame.draw.rect(self.terrain, OBSTACLE_COLOR, self.to_minimap_rect(obstacle))
+
+    def to_minimap(self, position):
+        return int(position[0] * self.scale[0]), int(position[1] * self.scale[1])
+
+    def to_minimap_rect(self, rect):
+        x, y = self.to_minimap(rect.topleft)
+        return pygame.Rect(x, y, max(1, round(rect.width * self.scale[0])), max(1, round(rect.height * self.scale[1])))
+
+    def density(self, entities):
+        """
+        Per-cell entity counts as strengths in 0..1, indexed [row, column].
+        `entities` are objects with a position or an (n, 2) array of positions.
+        """
+        if not len(entities):
+            return np.zeros((self.grid_size, self.grid_size))
+        positions = entities if isinstance(entities, np.ndarray) else entity_positions(entities)
+        counts, _, _ = np.histogram2d(positions[:, 0], positions[:, 1], self.bins)
+        return np.minimum(counts.T / self.saturation, 1.0)
+
+    def update(self, tick):
+        if self.last_update_tick is not None and 0 <= tick - self.last_update_tick < self.update_interval:
+            return
+        self.last_update_tick = tick
+        if self.terrain is None:
+            self.build_terrain()
+
+        enemies = self.density(self.world.enemies)
+        shards = self.density(self.world.astral_shards.positions)
+        # Shards are drawn over enemies wherever a cell has both
+        strength = np.maximum(enemies, shards)
+        color = np.where((shards >= enemies)[..., None], SHARD_COLOR, ENEMY_COLOR)
+        pixels = np.empty((self.grid_size, self.grid_size, 4), np.uint8)
+        pixels[..., :3] = color
+        pixels[..., 3] = (strength ** 0.5 * 220).astype(np.uint8)
+        heatmap = pygame.image.frombuffer(pixels.tobytes(), (self.grid_size, self.grid_size), "RGBA")
+
+        # A new surface each time, so frames already recorded keep their own
+        surface = self.terrain.copy()
+        surface.blit(pygame.transform.scale(heatmap, (self.size, self.size)), (0, 0))
+        self.surface = surface
+
+    def draw(self, screen, player, camera, margin=20):
+        if self.surface is None:
+            return
+        x, y = screen.get_width() - self.size - margin, margin
+        screen.blit(self.surface, (x, y))
+
+        view = self.to_minimap_rect(pygame.Rect(camera.offset.x, camera.offset.y, camera.screen_width, camera.screen_height))
+        pygame.draw.rect(screen, VIEW_COLOR, view.move(x, y).clip((x, y, self.size, self.size)), 1)
+        px, py = self.to_minimap(player.position)
+        pygame.draw.rect(screen, PLAYER_COLOR, (x + px - 2, y + py - 2, 4, 4))
+        pygame.draw.rect(screen, BORDER_COLOR, (x - 2, y - 2, self.size + 4, self.size + 4), 2)
@@ -0,0 +1,152 @@
+"""
+Hit sparks, impact splashes and death bursts.
+
+Particles are rows in preallocated NumPy arrays rather than Python objects:
+emitting fills a slice, updating is a few whole-array operations and dead
+particles are compacted away with a mask. Drawing culls to the screen and
+issues one `blits` call per texture.
+"""
+import math
+from itertools import repeat
+
+import numpy as np
+import pygame
+
+# Particle kinds: color and the square sizes it shrinks through over its life
+KINDS = [
+    ((255, 70, 50), (4, 3, 2)),     # HIT: enemy takes damage
+    ((255, 220, 120), (5, 3, 2)),   # IMPACT: projectile hits something
+    ((200, 30, 30), (6, 4, 2)),     # DEATH: enemy dies
+]
+HIT, IMPACT, DEATH = range(len(KINDS))
+FRAMES = 3
+
+
+class ParticleSystem:
+    def __init__(self, capacity, now=0.0, seed=0):
+        self.capacity = capacity
+        self.count = 0
+        self.position = np.zeros((capacity, 2), np.float32)
+        self.velocity = np.zeros((capacity, 2), np.float32)  # pixels per second
+        self.expires = np.zeros(capacity, np.float64)      # game time
+        self.lifetime = np.ones(capacity, np.float32)
+        self.kind = np.zeros(capacity, np.int16)
+        self.drag = 0.05  # fraction of the velocity left after one second
+        self.density = 1.0  # scales how many particles each effect emits
+        self.last_time = now
+        self.rng = np.random.default_rng(seed)
+        self.textures = None
+
+    def __len__(self):
+        return self.count
+
+    def build_textures(self):
+        self.textures = []
+        for color, sizes in KINDS:
+            for size in sizes:
+                surface = pygame.Surface((size, size))
+                surface.fill(color)
+                self.textures.append(surface)
+
+    def emit(self, position, count, kind, speed, lifetime, direction=None, spread=math.tau):
+        """
+        Emit up to `count` particles of `kind` at `position`, flying out at up
+        to `speed` px/s within `spread` radians around `direction` (all
+        around by default). Particles that don't fit under the cap are dropped.
+        """
+        count = min(round(count * self.density), self.capacity - self.count)
+        if count <= 0:
+            return
+        base_angle = math.atan2(direction[1], direction[0]) if direction is not None else 0.0
+        self.fill(position, count, kind, speed, lifetime, base_angle, spread)
+
+    def emit_each(self, positions, count, kind, speed, lifetime):
+        """emit() all around each of `positions`, an (n, 2) array, in one go."""
+        per_position = round(count * self.density)
+        if per_position <= 0:
+            return
+        positions = positions[:(self.capacity - self.count) // per_position]
+        if not len(positions):
+            return
+        self.fill(np.repeat(positions, per_position, axis=0), len(positions) * per_position, kind, speed, lifetime)
+
+    def fill(self, position, count, kind, speed, lifetime, base_angle=0.0, spread=math.tau):
+        rng = self.rng
+        angles = base_angle + rng.uniform(-spread / 2, spread / 2, count)
+        speeds = speed * rng.uniform(0.3, 1.0, count)
+        lifetimes = lifetime * rng.uniform(0.6, 1.0, count)
+
+        new = slice(self.count, self.count + count)
+        self.position[new] = position
+        self.velocity[new, 0] = np.cos(angles) * speeds
+        self.velocity[new, 1] = np.sin(angles) * speeds
+        self.lifetime[new] = lifetimes
+        self.expires[new] = self.last_time + lifetimes
+        self.kind[new] = kind
+        self.count += count
+
+    def hit(self, position):
+        self.emit(position, 4, HIT, speed=120, lifetime=0.25)
+
+    def impact(self, position, direction):
+        # Splash back the way the projectile came from
+        self.emit(position, 6, IMPACT, speed=180, lifetime=0.2, direction=-direction, spread=math.pi / 2)
+
+    def death(self, position):
+        self.emit(position, 16, DEATH, speed=160, lifetime=0.5)
+
+    def hits(self, positions):
+        self.emit_each(positions, 4, HIT, speed=120, lifetime=0.25)
+
+    def deaths(self, positions):
+        self.emit_each(positions, 16, DEATH, speed=160, lifetime=0.5)
+
+    def explosion(self, position, radius):
+        self.emit(position, 12 + radius // 8, IMPACT, speed=radius * 3, lifetime=0.3)
+
+    def update(self, now):
+        dt = now - self.last_time
+        self.last_time = now
+        n = self.count
+        if not n:
+            return
+        if dt > 0:
+            self.position[:n] += self.velocity[:n] * dt
+            self.velocity[:n] *= self.drag ** dt
+
+        alive = self.expires[:n] > now
+        if alive.all():
+            return
+        kept = int(np.count_nonzero(alive))
+        for values in (self.position, self.velocity, self.expires, self.lifetime, self.kind):
+            values[:kept] = values[:n][alive]
+        self.count = kept
+
+    def clear(self):
+        self.count = 0
+
+    def draw(self, screen, camera):
+        n = self.count
+        if not n:
+            return
+        if self.textures is None:
+            self.build_textures()
+        width, height = screen.get_size()
+        x = self.position[:n, 0] - camera.offset.x
+        y = self.position[:n, 1] - camera.offset.y
+        visible = (x > -8) & (x < width) & (y > -8) & (y < height)
+        if not visible.any():
+            return
+
+        # Texture = kind * FRAMES + how far through its life the particle is
+        age = 1 - (self.expires[:n][visible] - self.last_time) / self.lifetime[:n][visible]
+        frame = np.clip((age * FRAMES).astype(np.int16), 0, FRAMES - 1)
+        texture = self.kind[:n][visible] * FRAMES + frame
+        points = np.column_stack((x[visible], y[visible])).astype(np.int32)
+        order = np.argsort(texture, kind="stable")
+        texture, points = texture[order], points[order]
+        starts = np.flatnonzero(np.r_[True, texture[1:] != texture[:-1]])
+        ends = np.r_[starts[1:], len(texture)]
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            surface = self.textures[texture[start]]
+            screen.blits(zip(repeat(surface), points[start:end].tolist()), doreturn=False)
@@ -25,6 +25,10 @@ class PausedState:
                 elif event.key == pygame.K_r:
                     self.state_manager.switch_state("start")
                     self.game.reset_game()
+                elif event.key == pygame.K_s:
+                    self.game.save_run()
+                elif event.key == pygame.K_l and self.game.has_save():
+                    self.game.load_run()
 
     def update(self):
         pass
@@ -39,7 +43,7 @@ class PausedState:
         title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 4))
         screen.blit(title_text, title_rect)
 
-        instructions = ["Press ESC to Resume", "Press R to Restart", "Press X to Quit"]
+        instructions = ["Press ESC to Resume", "Press S to Save", "Press L to Load", "Press R to Restart", "Press X to Quit"]
         y_offset = title_rect.bottom + 50
 
         for instr in instructions:
@@ -2,50 +2,44 @@ import pygame
 import random
 
 from settings import *
+from src.animation import Animation, animations_clip_set
+from src.clock import game_clock
 from src.healthbar import HealthBar
 from src.inventory import Inventory
-
-
-class AnimationController:
-    def __init__(self, animations, animation_speed=5):
-        self.animations = animations
-        self.current_animation = "Idle"
-        self.current_frame = 0
-        self.animation_speed = animation_speed
-        self.last_update = pygame.time.get_ticks()
-
-    def set_animation(self, animation_name):
-        if animation_name != self.current_animation:
-            self.current_animation = animation_name
-            self.current_frame = 0
-
-    def update_animation(self):
-        now = pygame.time.get_ticks()
-        if now - self.last_update > 1000 // self.animation_speed:
-            self.last_update = now
-            self.current_frame = (self.current_frame + 1) % len(self.animations[self.current_animation])
-
-    def get_current_frame(self, facing_right=True):
-        frame = self.animations[self.current_animation][self.current_frame]
-        return pygame.transform.flip(frame, True, False) if not facing_right else frame
+from src.scheduler import scheduler
+from src.stats import StatBlock, stat_property
 
 
 class Player:
+    movement_speed = stat_property("movement_speed")
+    ability_power = stat_property("ability_power")
+    max_hp = stat_property("max_hp")
+    luck = stat_property("luck")
+    attack_speed = stat_property("attack_speed")
+    attack_range = stat_property("attack_range")
+    damage = stat_property("damage")
+
+    # Stats at the start of a run
+    BASE_STATS = {
+        "movement_speed": 3,
+        "ability_power": 15,
+        "max_hp": 100,
+        "luck": 1,
+        "attack_speed": 1,
+        "attack_range": 1,
+        "damage": 0,
+    }
+
     def __init__(self, x, y, animations, world, state_manager):
         self.world = world
         self.state_manager = state_manager
         self.position = pygame.math.Vector2(x, y)
         
-        # Stats
-        self.movement_speed = 3
-        self.ability_power = 15
+        # Stats (buffs and upgrades go through self.stats)
+        self.stats = StatBlock(self.BASE_STATS)
         self.hp = 100
-        self.max_hp = 100
-        self.luck = 1
         self.astral_shards = 100
         self.level = 1
-        self.attack_speed = 1
-        self.attack_range = 1
         
         # Invincibility / damage tracking
         self.invincible = False
@@ -55,7 +49,10 @@ class Player:
         # Inventory and animations
         self.inventory = Inventory()
         self.facing_right = True
-        self.animation_controller = AnimationController(animations)
+        # Frames (and their mirrored copies) are built once per set of loaded
+        # animations and shared by every run that uses them
+        clip_set = animations_clip_set(animations, fps=5)
+        self.animation = Animation(clip_set)
         first_animation_frames = next(iter(animations.values()))
         self.frame_width = first_animation_frames[0].get_width()
         self.frame_height = first_animation_frames[0].get_height()
@@ -79,19 +76,31 @@ class Player:
             self.hitbox_width,
             self.hitbox_height + 40
         )
-        
-        # Buffs dictionary
-        self.buffs = {}
 
         # DEBUG: Toggle this to True if you want to visualize the hitbox
         self.debug_hitbox = False
 
+    def reset(self, x, y):
+        """Start a new run at (x, y), keeping the loaded frames and hitbox."""
+        self.stats.set_state(self.BASE_STATS, [])
+        self.hp = self.max_hp
+        self.astral_shards = 100
+        self.level = 1
+        self.invincible = False
+        self.last_hit_time = 0
+        self.inventory = Inventory()
+        self.facing_right = True
+        self.animation.play("Idle", game_clock.game_time)
+        self.position.update(x, y)
+        self.rect.x = self.position.x - self.hitbox_width // 2
+        self.rect.y = self.position.y - self.hitbox_height // 2
+
     def draw(self, screen, camera):
         """
         Draw player sprite and health bar.
         Optionally draw a debug rectangle for the player's smaller hitbox.
         """
-        frame = self.animation_controller.get_current_frame(self.facing_right)
+        frame = self.animation.image(self.facing_right)
         screen_position = camera.apply_to_position(self.position)
 
         # Draw sprite centered around player's position
@@ -110,20 +119,11 @@ class Player:
 
     def update(self, keys):
         self.move(keys)
-        self.animation_controller.update_animation()
-        self.update_buffs()
-
-        # If invincible, check if invincibility has worn off
-        current_time = pygame.time.get_ticks() / 1000
-        if self.invincible and (current_time - self.last_hit_time) > self.invincibility_duration:
-            self.invincible = False
 
     def move(self, keys):
         # Decide on animation
-        if keys[pygame.K_w] or keys[pygame.K_s] or keys[pygame.K_a] or keys[pygame.K_d]:
-            self.animation_controller.set_animation("Run")
-        else:
-            self.animation_controller.set_animation("Idle")
+        moving = keys[pygame.K_w] or keys[pygame.K_s] or keys[pygame.K_a] or keys[pygame.K_d]
+        self.animation.play("Run" if moving else "Idle", game_clock.game_time)
 
         # Move and flip orientation
         if keys[pygame.K_a]:
@@ -147,70 +147,38 @@ class Player:
         self.rect.y = self.position.y - self.hitbox_height // 2
 
     def take_damage(self, damage):
-        current_time = pygame.time.get_ticks() / 1000
-        # Only take damage if not invincible or if invincibility has expired
-        if not self.invincible or (current_time - self.last_hit_time) > self.invincibility_duration:
+        # Only take damage if not invincible
+        if not self.invincible:
             self.hp -= damage
-            self.last_hit_time = current_time
-            self.invincible = True
-            self.world.add_floating_text(
-                text=str(damage),
-                target=self,
-                offset=(0, -20),
-                color=(255, 0, 0)
-            )
+            self.last_hit_time = game_clock.game_time
+            self.set_invincible_until(self.last_hit_time + self.invincibility_duration)
+            self.world.add_damage_number(damage, self, (255, 0, 0))
             if self.hp <= 0:
                 self.die()
 
+    def set_invincible_until(self, end_time):
+        self.invincible = True
+        scheduler.call_at(end_time, self.end_invincibility)
+
+    def end_invincibility(self):
+        self.invincible = False
+
     def die(self):
         print("Player has died.")
         self.state_manager.switch_state("end")
 
     def heal(self, amount):
         self.hp = min(self.hp + amount, self.max_hp)
-        self.world.add_floating_text(
-            text=str(amount),
-            target=self,
-            offset=(0, -20),
-            color=(0, 255, 0)
-        )
+        self.world.add_damage_number(amount, self, (0, 255, 0))
 
     def add_buff(self, effect, magnitude, duration):
-        end_time = pygame.time.get_ticks() / 1000 + duration
-        self.buffs[effect] = {"magnitude": magnitude, "end_time": end_time}
-
-        # Apply the buff immediately
-        if effect == "movement_speed":
-            self.movement_speed += magnitude
-        elif effect == "damage":
-            # If you want a separate damage stat, define it in __init__ first
-            if not hasattr(self, "damage"):
-                self.damage = 0
-            self.damage += magnitude
-        elif effect == "luck":
-            self.luck += magnitude
-        elif effect == "ability_power":
-            self.ability_power += magnitude
+        """Temporary additive bonus; using the same buff again refreshes it."""
+        self.stats.add_modifier(
+            effect, magnitude, source=f"buff:{effect}", expires_at=game_clock.game_time + duration
+        )
 
     def update_buffs(self):
-        current_time = pygame.time.get_ticks() / 1000
-        expired_buffs = []
-        for effect, data in self.buffs.items():
-            if data["end_time"] <= current_time:
-                expired_buffs.append(effect)
-
-        # Remove expired buffs
-        for effect in expired_buffs:
-            magnitude = self.buffs[effect]["magnitude"]
-            if effect == "movement_speed":
-                self.movement_speed -= magnitude
-            elif effect == "damage":
-                self.damage -= magnitude
-            elif effect == "luck":
-                self.luck -= magnitude
-            elif effect == "ability_power":
-                self.ability_power -= magnitude
-            del self.buffs[effect]
+        self.stats.expire(game_clock.game_time)
 
     def collect_astral_shard(self):
         """
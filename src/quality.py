@@ -0,0 +1,70 @@
+"""
+Adaptive quality: trade optional work for frame time when the game can't
+keep up with settings.FPS.
+
+Movement is per frame, so a slow frame slows the whole game down. The
+governor averages frame time over a window of frames and, when it goes over
+the budget, reduces the next optional feature in QUALITY_STEPS order. Once
+frames have been comfortably under budget for several windows in a row it
+restores the most recently reduced one.
+"""
+from collections import deque
+
+import settings
+
+# In the order they are reduced (and restored in reverse)
+QUALITY_STEPS = ("floating_texts", "health_bars", "particles", "offscreen_updates", "render_scale")
+
+
+class QualityGovernor:
+    def __init__(self, game):
+        self.game = game
+        self.budget_ms = 1000 / settings.FPS
+        self.samples = deque(maxlen=settings.QUALITY_WINDOW)
+        self.level = 0  # how many QUALITY_STEPS are currently reduced
+        self.headroom_windows = 0
+        self.average_ms = 0.0
+
+    def reduced(self, step):
+        return QUALITY_STEPS.index(step) < self.level
+
+    def record(self, frame_ms):
+        """Add one frame's work time; re-evaluated once per full window."""
+        self.samples.append(frame_ms)
+        if len(self.samples) < self.samples.maxlen:
+            return
+        self.average_ms = sum(self.samples) / len(self.samples)
+        self.samples.clear()
+
+        if self.average_ms > self.budget_ms * settings.QUALITY_REDUCE_AT:
+            self.headroom_windows = 0
+            if self.level < len(QUALITY_STEPS):
+                self.set_level(self.level + 1)
+        elif self.average_ms < self.budget_ms * settings.QUALITY_RESTORE_AT:
+            # Hysteresis: restore only after several good windows in a row,
+            # and far enough under budget that the restored work still fits
+            self.headroom_windows += 1
+            if self.headroom_windows >= settings.QUALITY_RESTORE_WINDOWS and self.level > 0:
+                self.headroom_windows = 0
+                self.set_level(self.level - 1)
+        else:
+            self.headroom_windows = 0
+
+    def set_level(self, level):
+        self.level = level
+        self.apply()
+
+    def apply(self):
+        """Push the current level to the systems it controls."""
+        game, world = self.game, self.game.world
+        world.floating_texts.set_enabled(not self.reduced("floating_texts"))
+        world.show_enemy_health_bars = not self.reduced("health_bars")
+        world.particles.density = settings.QUALITY_PARTICLE_DENSITY if self.reduced("particles") else 1.0
+        world.set_lod_interval_scale(settings.QUALITY_LOD_INTERVAL_SCALE if self.reduced("offscreen_updates") else 1)
+        scale = settings.QUALITY_RENDER_SCALE if self.reduced("render_scale") else 1.0
+        if scale != game.render_scale_factor:
+            game.set_render_scale_factor(scale)
+
+    def describe(self):
+        """One (step, state) pair per quality step, for the debug overlay."""
+        return [(step, "reduced" if self.reduced(step) else "full") for step in QUALITY_STEPS]
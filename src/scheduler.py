@@ -0,0 +1,60 @@
+import heapq
+from itertools import count
+
+from src.clock import game_clock
+
+
+class ScheduledEvent:
+    __slots__ = ("when", "order", "callback", "args", "cancelled")
+
+    def __init__(self, when, order, callback, args):
+        self.when = when
+        self.order = order
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.when, self.order) < (other.when, other.order)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """
+    Runs callbacks at a given game time. Pending events sit in a min-heap, so
+    each frame only touches the events that are actually due instead of every
+    object polling its own timers. Deadlines are on the game clock, which stops
+    while the game is paused, so nothing fires early after a pause. Events due
+    on the same frame run in the order they were scheduled.
+    """
+
+    def __init__(self, clock=game_clock):
+        self.clock = clock
+        self.events = []
+        self.order = count()
+
+    def call_at(self, when, callback, *args):
+        event = ScheduledEvent(when, next(self.order), callback, args)
+        heapq.heappush(self.events, event)
+        return event
+
+    def call_later(self, delay, callback, *args):
+        return self.call_at(self.clock.game_time + delay, callback, *args)
+
+    def run_due(self):
+        """Run every event that is due. Call once per frame."""
+        now = self.clock.game_time
+        events = self.events
+        while events and events[0].when <= now:
+            event = heapq.heappop(events)
+            if not event.cancelled:
+                event.callback(*event.args)
+
+    def clear(self):
+        """Drop all pending events, e.g. when a run is replaced."""
+        self.events = []
+
+
+scheduler = Scheduler()
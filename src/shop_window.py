@@ -1,7 +1,6 @@
 import pygame
 import json
 import logging
-import settings 
 
 class Shop:
     def __init__(self, font, player, consumable_manager, shop_data_file):
@@ -32,6 +31,13 @@ class Shop:
             data = json.load(f)
         return data["items"]
 
+    def reset(self):
+        """
+        Close the shop for a new run.
+        """
+        self.visible = False
+        self.selected_index = 0
+
     def toggle(self):
         """
         Toggle the visibility of the shop.
@@ -84,25 +90,19 @@ class Shop:
         Apply the buff effect of a purchased item.
         """
         effect, magnitude, duration = item["effect"], item["magnitude"], item.get("duration", 0)
+        stats = self.player.stats
         if effect == "max_hp":
             # Permanent max HP increase
-            self.player.max_hp += magnitude
+            stats.add_base("max_hp", magnitude)
             self.player.hp = self.player.max_hp
-        else:
-            # Apply other effects (permanent or temporary)
-            if duration == 0:
-                if effect == "movement_speed":
-                    self.player.movement_speed += magnitude
-                elif effect == "ability_power":
-                    self.player.ability_power += magnitude
-                elif effect == "attack_speed":
-                    self.player.attack_speed *= magnitude
-                elif effect == "attack_range":
-                    self.player.attack_range *= magnitude
-                elif effect == "luck":
-                    self.player.luck += magnitude
+        elif duration == 0:
+            # Permanent upgrades raise the base value
+            if effect in ("attack_speed", "attack_range"):
+                stats.scale_base(effect, magnitude)
             else:
-                self.player.add_buff(effect, magnitude, duration)
+                stats.add_base(effect, magnitude)
+        else:
+            self.player.add_buff(effect, magnitude, duration)
 
     def add_consumable(self, item):
         """
@@ -121,13 +121,14 @@ class Shop:
         """
         if not self.visible:
             return
+        width, height = screen.get_size()
         # Draw semi-transparent overlay
-        overlay = pygame.Surface((settings.WIDTH, settings.HEIGHT), pygame.SRCALPHA)
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))
         screen.blit(overlay, (0, 0))
         # Shop box and borders
-        shop_width, shop_height = settings.WIDTH - 200, settings.HEIGHT - 200
-        shop_rect = pygame.Rect((settings.WIDTH - shop_width) // 2, (settings.HEIGHT - shop_height) // 2, shop_width, shop_height)
+        shop_width, shop_height = width - 200, height - 200
+        shop_rect = pygame.Rect((width - shop_width) // 2, (height - shop_height) // 2, shop_width, shop_height)
         pygame.draw.rect(screen, (50, 50, 50), shop_rect)
         pygame.draw.rect(screen, (255, 255, 255), shop_rect, 2)
         # Display Astral Shards balance
@@ -0,0 +1,332 @@
+"""
+Compact binary snapshot of a whole run, used for saving and resuming.
+
+The file is a fixed sequence of sections after a magic/version header. Entity
+data is stored column by column as packed arrays, so saving thousands of
+enemies is a handful of bulk copies rather than per-object serialization.
+Times on the game clock are stored relative to the moment of saving; times
+on the run timer are stored as they are and come back with the timer.
+"""
+import os
+import struct
+import sys
+from array import array
+from itertools import chain
+
+import numpy as np
+import pygame
+from src.bullets import ROTATIONS
+from src.clock import game_clock
+from src.enemy import Demon, create_enemy
+from src.scheduler import scheduler
+from src.stats import ADD, MULTIPLY, Modifier
+from src.weapon import Projectile
+
+MAGIC = b"ASRS"
+VERSION = 4
+
+JUMP_STATES = ["idle", "rising", "disappeared"]
+OPERATIONS = [ADD, MULTIPLY]
+
+
+class _Writer:
+    def __init__(self):
+        self.chunks = []
+
+    def struct(self, fmt, *values):
+        self.chunks.append(struct.pack("<" + fmt, *values))
+
+    def array(self, typecode, values):
+        data = array(typecode, values)
+        if sys.byteorder == "big":
+            data.byteswap()
+        self.struct("I", len(data))
+        self.chunks.append(data.tobytes())
+
+    def strings(self, values):
+        encoded = "\0".join(values).encode("utf-8")
+        self.struct("II", len(values), len(encoded))
+        self.chunks.append(encoded)
+
+    def getvalue(self):
+        return b"".join(self.chunks)
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def struct(self, fmt):
+        fmt = "<" + fmt
+        values = struct.unpack_from(fmt, self.data, self.offset)
+        self.offset += struct.calcsize(fmt)
+        return values
+
+    def array(self, typecode):
+        (length,) = self.struct("I")
+        data = array(typecode)
+        size = length * data.itemsize
+        data.frombytes(self.data[self.offset:self.offset + size])
+        self.offset += size
+        if sys.byteorder == "big":
+            data.byteswap()
+        return data
+
+    def strings(self):
+        count, size = self.struct("II")
+        encoded = bytes(self.data[self.offset:self.offset + size])
+        self.offset += size
+        return encoded.decode("utf-8").split("\0") if count else []
+
+
+# -------------------------------------------------------------------------
+# Save
+# -------------------------------------------------------------------------
+
+def snapshot_bytes(game):
+    """Serialize the running game (player, inventory, timer, waves and world)."""
+    now = game_clock.game_time
+    player, world, wave_manager = game.player, game.world, game.wave_manager
+    weapon_manager = game.weapon_manager
+    # Enemies killed this tick stay in world.enemies until World.update sweeps
+    # them out, with their events already cancelled; they aren't saved
+    enemies = [enemy for enemy in world.enemies if enemy.hp > 0]
+
+    names = []
+    name_index = {}
+
+    def intern(name):
+        if name not in name_index:
+            name_index[name] = len(names)
+            names.append(name)
+        return name_index[name]
+
+    enemy_types = [intern(enemy.enemy_type) for enemy in enemies]
+    stats = player.stats
+    stat_names = [intern(stat) for stat in stats.base]
+    modifier_names = [(intern(m.stat), intern(m.source)) for m in stats.modifiers]
+    slots = player.inventory.consumables
+    slot_names = [intern(item.name) if item else -1 for item in slots]
+    weapon_name = intern(weapon_manager.active_weapon_name) if weapon_manager.active_weapon_name else -1
+    bullets = world.bullets
+    bullet_images = [intern(path) for path, _ in bullets.sprites]
+
+    out = _Writer()
+    out.struct("4sH", MAGIC, VERSION)
+    out.struct("dII", game.timer.get_time(), world.tick, world.enemy_serial)
+    out.strings(names)
+
+    # Player: base stats plus the modifier stack (modifiers keep their expiry)
+    out.struct(
+        "2f3d2BI",
+        player.position.x, player.position.y,
+        player.hp, player.astral_shards, player.last_hit_time - now,
+        player.invincible, player.facing_right, player.level,
+    )
+    out.array("H", stat_names)
+    out.array("d", stats.base.values())
+    out.array("H", chain.from_iterable(modifier_names))
+    out.array("B", [OPERATIONS.index(m.operation) for m in stats.modifiers])
+    out.array("d", [m.value for m in stats.modifiers])
+    out.array("d", [float("nan") if m.expires_at is None else m.expires_at - now for m in stats.modifiers])
+
+    # Inventory and weapon
+    out.array("h", slot_names)
+    out.array("B", [(item.is_active | item.is_used << 1) if item else 0 for item in slots])
+    out.array("d", [(item.start_time - now) if item and item.start_time is not None else 0 for item in slots])
+    last_shot = weapon_manager.active_weapon.last_shot_time - now if weapon_manager.active_weapon else 0
+    out.struct("hd", weapon_name, last_shot)
+
+    # Wave cursor, including what is left to spawn in every group
+    out.struct("iid", wave_manager.wave_index, wave_manager.enemies_spawned, wave_manager.wave_start_offset)
+    out.array("i", [group["count"] for wave in wave_manager.waves for group in wave["enemies"]])
+
+    # Enemies
+    out.array("H", enemy_types)
+    out.array("f", chain.from_iterable(enemy.position for enemy in enemies))
+    out.array("f", [enemy.hp for enemy in enemies])
+
+    demons = [(index, enemy) for index, enemy in enumerate(enemies) if isinstance(enemy, Demon)]
+    out.array("I", [index for index, _ in demons])
+    out.array("B", [JUMP_STATES.index(demon.jump_state) for _, demon in demons])
+    out.array("d", chain.from_iterable(
+        (demon.jump_event.when - now, demon.fire_event.when - now if demon.fire_event else float("nan"))
+        for _, demon in demons
+    ))
+    no_position = (float("nan"), float("nan"))
+    out.array("f", chain.from_iterable(
+        no_position if demon.reappear_position is None else demon.reappear_position for _, demon in demons
+    ))
+
+    # The player's projectiles
+    out.array("f", chain.from_iterable(
+        (*p.position, *p.start_position, *p.direction, p.speed, p.damage, p.range)
+        for p in weapon_manager.projectiles
+    ))
+
+    # Enemy bullets: the sprites they use, then the live rows
+    n = bullets.count
+    out.array("H", bullet_images)
+    out.array("d", [size for _, size in bullets.sprites])
+    out.array("f", bullets.position[:n].ravel().tolist())
+    out.array("f", bullets.velocity[:n].ravel().tolist())
+    out.array("f", bullets.remaining[:n].tolist())
+    out.array("f", bullets.damage[:n].tolist())
+    out.array("H", bullets.texture[:n].tolist())
+
+    # Shards
+    out.array("f", world.astral_shards.positions.ravel().tolist())
+    return out.getvalue()
+
+
+def save_snapshot(game, path):
+    """Write the snapshot next to `path` first so a crash mid-save keeps the old file."""
+    data = snapshot_bytes(game)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+# -------------------------------------------------------------------------
+# Load
+# -------------------------------------------------------------------------
+
+def restore_snapshot(game, data):
+    """Replace the running game's state with a snapshot from snapshot_bytes()."""
+    now = game_clock.game_time
+    player, world, wave_manager = game.player, game.world, game.wave_manager
+    weapon_manager = game.weapon_manager
+
+    reader = _Reader(data)
+    magic, version = reader.struct("4sH")
+    if magic != MAGIC:
+        raise ValueError("Not an Astral Shards save file.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported save version {version} (expected {VERSION}).")
+
+    timer_seconds, world.tick, world.enemy_serial = reader.struct("dII")
+    game.timer.set_time(timer_seconds)
+    # Pending events belong to the state being replaced; restored objects reschedule their own
+    scheduler.clear()
+    names = reader.strings()
+
+    # Player
+    (x, y, player.hp, player.astral_shards, last_hit,
+     invincible, facing_right, player.level) = reader.struct("2f3d2BI")
+    stats = player.stats
+    player.position.update(x, y)
+    player.rect.x = player.position.x - player.hitbox_width // 2
+    player.rect.y = player.position.y - player.hitbox_height // 2
+    player.astral_shards = int(player.astral_shards)
+    player.last_hit_time = now + last_hit
+    player.invincible, player.facing_right = bool(invincible), bool(facing_right)
+    if player.invincible:
+        player.set_invincible_until(player.last_hit_time + player.invincibility_duration)
+    stat_names, base_values = reader.array("H"), reader.array("d")
+    modifier_names, operations = reader.array("H"), reader.array("B")
+    values, remaining = reader.array("d"), reader.array("d")
+    stats.set_state(
+        {names[stat]: value for stat, value in zip(stat_names, base_values)},
+        [
+            Modifier(
+                names[modifier_names[2 * i]], OPERATIONS[operation], value,
+                names[modifier_names[2 * i + 1]], None if left != left else now + left,
+            )
+            for i, (operation, value, left) in enumerate(zip(operations, values, remaining))
+        ],
+    )
+
+    # Inventory and weapon
+    slot_names, slot_flags, slot_starts = reader.array("h"), reader.array("B"), reader.array("d")
+    slots = player.inventory.consumables
+    for i, (name, flags, start) in enumerate(zip(slot_names, slot_flags, slot_starts)):
+        item = game.consumable_manager.create_consumable(names[name]) if name >= 0 else None
+        if item:
+            item.is_active, item.is_used = bool(flags & 1), bool(flags & 2)
+            item.start_time = now + start if item.is_used else None
+            if item.is_active:
+                item.schedule_expiry(player.inventory.remove_consumable)
+        slots[i] = item
+    weapon_name, last_shot = reader.struct("hd")
+    if weapon_name >= 0:
+        weapon_manager.equip_weapon(names[weapon_name])
+        weapon_manager.active_weapon.last_shot_time = now + last_shot
+        player.inventory.equip("weapon", weapon_manager.weapon_data[names[weapon_name]])
+
+    # Wave cursor
+    wave_manager.waves = wave_manager.load_waves(wave_manager.wave_file)
+    wave_manager.wave_index, wave_manager.enemies_spawned, wave_manager.wave_start_offset = reader.struct("iid")
+    counts = iter(reader.array("i"))
+    for wave in wave_manager.waves:
+        for group in wave["enemies"]:
+            group["count"] = next(counts)
+    if wave_manager.wave_index < len(wave_manager.waves):
+        wave_manager.current_wave = wave_manager.waves[wave_manager.wave_index]
+    else:
+        wave_manager.current_wave = None
+
+    # Enemies
+    enemy_serial = world.enemy_serial
+    types, positions, hps = reader.array("H"), reader.array("f"), reader.array("f")
+    world.enemies = []
+    for i, (enemy_type, hp) in enumerate(zip(types, hps)):
+        enemy = create_enemy(names[enemy_type], positions[2 * i], positions[2 * i + 1], game.enemy_data, world)
+        enemy.hp = hp
+        world.add_enemy(enemy)
+    world.enemy_serial = enemy_serial
+
+    demon_indices, jump_states = reader.array("I"), reader.array("B")
+    demon_times, reappear = reader.array("d"), reader.array("f")
+    for i, (index, jump_state) in enumerate(zip(demon_indices, jump_states)):
+        demon = world.enemies[index]
+        demon.jump_state = JUMP_STATES[jump_state]
+        jump_in, fire_in = demon_times[2 * i:2 * i + 2]
+        demon.schedule(now + jump_in, None if fire_in != fire_in else now + fire_in)
+        reappear_x, reappear_y = reappear[2 * i], reappear[2 * i + 1]
+        demon.reappear_position = None if reappear_x != reappear_x else pygame.math.Vector2(reappear_x, reappear_y)
+
+    # The player's projectiles
+    values = reader.array("f")
+    weapon_manager.projectiles = []
+    for i in range(0, len(values), 9):
+        x, y, start_x, start_y, direction_x, direction_y, speed, damage, max_range = values[i:i + 9]
+        position = pygame.math.Vector2(x, y)
+        image = weapon_manager.active_weapon.image
+        projectile = Projectile(position, position + (direction_x, direction_y), speed, damage, max_range, image)
+        projectile.start_position.update(start_x, start_y)
+        projectile.direction.update(direction_x, direction_y)
+        weapon_manager.active_weapon.configure(projectile)
+        weapon_manager.projectiles.append(projectile)
+
+    # Enemy bullets, with sprite ids mapped onto this run's sprites
+    bullets = world.bullets
+    image_names, sizes = reader.array("H"), reader.array("d")
+    sprites = np.array([bullets.sprite(names[image], size) for image, size in zip(image_names, sizes)], np.int16)
+    positions, velocities = reader.array("f"), reader.array("f")
+    remaining, damages, textures = reader.array("f"), reader.array("f"), reader.array("H")
+    n = bullets.count = min(len(remaining), bullets.capacity)
+    bullets.position[:n] = np.frombuffer(positions, np.float32).reshape(-1, 2)[:n]
+    bullets.velocity[:n] = np.frombuffer(velocities, np.float32).reshape(-1, 2)[:n]
+    bullets.speed[:n] = np.hypot(bullets.velocity[:n, 0], bullets.velocity[:n, 1])
+    bullets.remaining[:n] = np.frombuffer(remaining, np.float32)[:n]
+    bullets.damage[:n] = np.frombuffer(damages, np.float32)[:n]
+    textures = np.frombuffer(textures, np.uint16)[:n].astype(np.int16)
+    if n:
+        sprite = sprites[textures // ROTATIONS]
+        bullets.texture[:n] = sprite * ROTATIONS + textures % ROTATIONS
+        bullets.radius[:n] = np.array(bullets.radii, np.float32)[sprite]
+
+    # Shards
+    world.astral_shards.clear()
+    world.astral_shards.add(np.frombuffer(reader.array("f"), np.float32))
+
+    world.floating_texts.clear()
+    world.particles.clear()
+    world.enemy_index_tick = -1
+
+
+def load_snapshot(game, path):
+    with open(path, "rb") as f:
+        restore_snapshot(game, f.read())
@@ -0,0 +1,219 @@
+import heapq
+
+import numpy as np
+
+# The cell itself plus half of its 8 neighbours, so each adjacent pair of cells is visited once
+FORWARD_CELLS = [(0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
+# The cell itself and all 8 neighbours
+ADJACENT_CELLS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+def candidate_pairs(positions, cell_size):
+    """
+    Bucket `positions` (an (n, 2) array) into a uniform grid and return two index
+    arrays (first, second) listing every pair of points in the same or adjacent
+    cells exactly once. Cost grows with the number of nearby pairs, not n².
+    """
+    n = len(positions)
+    if n < 2:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+
+    cells = np.floor(positions / cell_size).astype(np.int64)
+    # Leave a one-cell margin so neighbour keys never wrap into another column
+    cells -= cells.min(axis=0) - 1
+    height = int(cells[:, 1].max()) + 2
+    keys = cells[:, 0] * height + cells[:, 1]
+
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    rank = np.arange(n)
+
+    firsts, seconds = [], []
+    for dx, dy in FORWARD_CELLS:
+        target = sorted_keys + (dx * height + dy)
+        end = np.searchsorted(sorted_keys, target, side="right")
+        if dx == 0 and dy == 0:
+            # Same cell: only the points sorted after this one
+            start = rank + 1
+        else:
+            start = np.searchsorted(sorted_keys, target, side="left")
+        counts = np.maximum(end - start, 0)
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        first = np.repeat(rank, counts)
+        range_starts = np.repeat(start - (np.cumsum(counts) - counts), counts)
+        second = np.arange(total) + range_starts
+        firsts.append(order[first])
+        seconds.append(order[second])
+
+    if not firsts:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+def cross_pairs(positions, others, cell_size):
+    """
+    Like candidate_pairs, but between two sets: every (i, j) where
+    `positions[i]` and `others[j]` are in the same or adjacent cells.
+    """
+    empty = np.empty(0, dtype=np.intp)
+    if not len(positions) or not len(others):
+        return empty, empty
+
+    cells = np.floor(positions / cell_size).astype(np.int64)
+    other_cells = np.floor(others / cell_size).astype(np.int64)
+    origin = np.minimum(cells.min(axis=0), other_cells.min(axis=0)) - 1
+    cells -= origin
+    other_cells -= origin
+    height = int(max(cells[:, 1].max(), other_cells[:, 1].max())) + 2
+    keys = cells[:, 0] * height + cells[:, 1]
+    other_keys = other_cells[:, 0] * height + other_cells[:, 1]
+
+    order = np.argsort(other_keys, kind="stable")
+    sorted_keys = other_keys[order]
+    # Searching for sorted keys is several times faster
+    rank = np.argsort(keys, kind="stable")
+    keys = keys[rank]
+
+    firsts, seconds = [], []
+    for dx, dy in ADJACENT_CELLS:
+        target = keys + (dx * height + dy)
+        start = np.searchsorted(sorted_keys, target, side="left")
+        counts = np.searchsorted(sorted_keys, target, side="right") - start
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        firsts.append(np.repeat(rank, counts))
+        seconds.append(order[np.arange(total) + np.repeat(start - (np.cumsum(counts) - counts), counts)])
+
+    if not firsts:
+        return empty, empty
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+class SpatialGrid:
+    """
+    Uniform hash grid of objects with a `rect`, bucketed by their centre and
+    rebuilt in bulk. Rect queries are padded by the largest half-extent seen,
+    so they return every object whose rect could overlap the query. Radius
+    and nearest-neighbour queries measure to rect centres.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.padding = 0
+        self.bounds = None  # (min x, min y, max x, max y) of occupied cells
+
+    def rebuild(self, items):
+        cells = {}
+        cell_size = self.cell_size
+        padding = 0
+        for item in items:
+            rect = item.rect
+            key = (rect.centerx // cell_size, rect.centery // cell_size)
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [item]
+            else:
+                bucket.append(item)
+            half_extent = max(rect.width, rect.height) // 2 + 1
+            if half_extent > padding:
+                padding = half_extent
+        self.cells = cells
+        self.padding = padding
+        if cells:
+            xs = [x for x, _ in cells]
+            ys = [y for _, y in cells]
+            self.bounds = (min(xs), min(ys), max(xs), max(ys))
+        else:
+            self.bounds = None
+
+    def query_rect(self, rect):
+        """Broadphase candidates for `rect`; callers still do the exact test."""
+        cell_size = self.cell_size
+        padding = self.padding
+        first_x = (rect.left - padding) // cell_size
+        last_x = (rect.right + padding) // cell_size
+        first_y = (rect.top - padding) // cell_size
+        last_y = (rect.bottom + padding) // cell_size
+        cells = self.cells
+        found = []
+        for y in range(first_y, last_y + 1):
+            for x in range(first_x, last_x + 1):
+                bucket = cells.get((x, y))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def query_radius(self, center, radius, accept=None):
+        """Every object whose centre is within `radius` of `center` (unordered)."""
+        cell_size = self.cell_size
+        cx, cy = center
+        radius_sq = radius * radius
+        cells = self.cells
+        found = []
+        for y in range(int((cy - radius) // cell_size), int((cy + radius) // cell_size) + 1):
+            for x in range(int((cx - radius) // cell_size), int((cx + radius) // cell_size) + 1):
+                bucket = cells.get((x, y))
+                if not bucket:
+                    continue
+                for item in bucket:
+                    ix, iy = item.rect.center
+                    if (ix - cx) ** 2 + (iy - cy) ** 2 <= radius_sq and (accept is None or accept(item)):
+                        found.append(item)
+        return found
+
+    def nearest(self, center, k=1, max_distance=None, accept=None):
+        """
+        Up to `k` objects closest to `center`, nearest first, optionally only
+        those within `max_distance` and those `accept(item)` is true for.
+        Searches rings of cells outwards and stops once no unvisited cell can
+        hold anything closer than the k-th best found so far.
+        """
+        if self.bounds is None or k <= 0:
+            return []
+        cell_size = self.cell_size
+        cx, cy = center
+        home_x, home_y = int(cx // cell_size), int(cy // cell_size)
+        min_x, min_y, max_x, max_y = self.bounds
+        # Past this ring, every occupied cell has been visited
+        last_ring = max(home_x - min_x, max_x - home_x, home_y - min_y, max_y - home_y)
+        if max_distance is not None:
+            last_ring = min(last_ring, int(max_distance // cell_size) + 1)
+            limit_sq = max_distance * max_distance
+        else:
+            limit_sq = float("inf")
+
+        cells = self.cells
+        best = []  # max-heap of (-distance², serial, item)
+        serial = 0
+        for ring in range(last_ring + 1):
+            if ring == 0:
+                ring_cells = [(home_x, home_y)]
+            else:
+                top, bottom = home_y - ring, home_y + ring
+                left, right = home_x - ring, home_x + ring
+                ring_cells = [(x, y) for x in range(left, right + 1) for y in (top, bottom)]
+                ring_cells += [(x, y) for y in range(top + 1, bottom) for x in (left, right)]
+            for key in ring_cells:
+                bucket = cells.get(key)
+                if not bucket:
+                    continue
+                for item in bucket:
+                    ix, iy = item.rect.center
+                    distance_sq = (ix - cx) ** 2 + (iy - cy) ** 2
+                    if distance_sq > limit_sq or (accept is not None and not accept(item)):
+                        continue
+                    serial += 1
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance_sq, serial, item))
+                    elif distance_sq < -best[0][0]:
+                        heapq.heapreplace(best, (-distance_sq, serial, item))
+            # Anything in later rings is at least `ring` cells away
+            if len(best) == k and -best[0][0] <= (ring * cell_size) ** 2:
+                break
+        return [item for _, _, item in sorted(best, reverse=True)]
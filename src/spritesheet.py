@@ -1,8 +1,13 @@
 import pygame
+from src.image_cache import load_image
 
 class SpriteSheet:
+    """
+    A sheet of equally sized frames, read left to right and top to bottom.
+    Frames are subsurfaces of the sheet, so slicing copies no pixels.
+    """
     def __init__(self, image_path, frame_width, frame_height):
-        self.sprite_sheet = pygame.image.load(image_path).convert_alpha()
+        self.sprite_sheet = load_image(image_path)
         self.frame_width = frame_width
         self.frame_height = frame_height
         self.frames = []
@@ -10,8 +15,8 @@ class SpriteSheet:
 
     def _split_sheet(self):
         sheet_width, sheet_height = self.sprite_sheet.get_size()
-        for y in range(0, sheet_height, self.frame_height):
-            for x in range(0, sheet_width, self.frame_width):
+        for y in range(0, sheet_height - self.frame_height + 1, self.frame_height):
+            for x in range(0, sheet_width - self.frame_width + 1, self.frame_width):
                 frame = self.sprite_sheet.subsurface(pygame.Rect(x, y, self.frame_width, self.frame_height))
                 self.frames.append(frame)
 
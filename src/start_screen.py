@@ -3,13 +3,14 @@ import time
 import math
 
 class StartScreen:
-    def __init__(self, font, state_manager):
+    def __init__(self, font, state_manager, game=None):
         self.font = font
         self.large_font = pygame.font.Font("assets/fonts/dogicabold.ttf", 32)
         self.running = True
         self.start_button_rect = None
         self.start_time = time.time()
         self.state_manager = state_manager
+        self.game = game
 
         # Load the background image
         self.background_image = pygame.image.load("assets/images/backgrounds/start_bg.png")
@@ -27,6 +28,10 @@ class StartScreen:
                 if event.key in (pygame.K_RETURN, pygame.K_SPACE):
                     self.running = False
                     self.state_manager.switch_state("gameplay")
+                elif event.key == pygame.K_l and self.game and self.game.has_save():
+                    self.game.load_run()
+                    self.running = False
+                    self.state_manager.switch_state("gameplay")
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if self.start_button_rect and self.start_button_rect.collidepoint(event.pos):
                     self.running = False
@@ -57,6 +62,7 @@ class StartScreen:
             "Movement: W A S D",
             "Open Shop: B",
             "Use Items: 1-5",
+            "Continue Saved Run: L",
             "Press Enter or Click the button below to start."
         ]
 
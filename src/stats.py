@@ -0,0 +1,87 @@
+import math
+from collections import namedtuple
+
+# `source` identifies who applied the modifier (e.g. "buff:luck"); applying a
+# modifier from the same source again replaces it instead of stacking.
+# `expires_at` is in game-clock seconds, or None for permanent modifiers.
+Modifier = namedtuple("Modifier", "stat operation value source expires_at")
+
+ADD = "add"
+MULTIPLY = "multiply"
+
+
+class StatBlock:
+    """
+    Base stat values plus a stack of modifiers. Derived values are
+    (base + additive modifiers) * multiplicative modifiers, applied in the
+    order they were added, and are cached until the base values or the
+    modifier set change.
+    """
+
+    def __init__(self, base):
+        self.base = dict(base)
+        self.modifiers = []
+        self.values = {}
+        self.dirty = True
+        self.next_expiry = math.inf
+
+    def get(self, stat):
+        if self.dirty:
+            self.recompute()
+        return self.values[stat]
+
+    def recompute(self):
+        values = dict(self.base)
+        for modifier in self.modifiers:
+            if modifier.operation == ADD:
+                values[modifier.stat] += modifier.value
+        for modifier in self.modifiers:
+            if modifier.operation == MULTIPLY:
+                values[modifier.stat] *= modifier.value
+        self.values = values
+        self.dirty = False
+
+    def add_base(self, stat, amount):
+        self.base[stat] += amount
+        self.dirty = True
+
+    def scale_base(self, stat, factor):
+        self.base[stat] *= factor
+        self.dirty = True
+
+    def add_modifier(self, stat, value, source, operation=ADD, expires_at=None):
+        self.modifiers = [modifier for modifier in self.modifiers if modifier.source != source]
+        self.modifiers.append(Modifier(stat, operation, value, source, expires_at))
+        self._modifiers_changed()
+
+    def remove_source(self, source):
+        self.modifiers = [modifier for modifier in self.modifiers if modifier.source != source]
+        self._modifiers_changed()
+
+    def set_state(self, base, modifiers):
+        """Replace the base values and the whole modifier stack (used when loading a save)."""
+        self.base = dict(base)
+        self.modifiers = list(modifiers)
+        self._modifiers_changed()
+
+    def expire(self, now):
+        """Drop modifiers whose time is up. Cheap when nothing is due."""
+        if now < self.next_expiry:
+            return
+        self.modifiers = [
+            modifier for modifier in self.modifiers
+            if modifier.expires_at is None or modifier.expires_at > now
+        ]
+        self._modifiers_changed()
+
+    def _modifiers_changed(self):
+        self.next_expiry = min(
+            (modifier.expires_at for modifier in self.modifiers if modifier.expires_at is not None),
+            default=math.inf,
+        )
+        self.dirty = True
+
+
+def stat_property(stat):
+    """Read-only attribute that returns the cached derived value of `stat`."""
+    return property(lambda self: self.stats.get(stat))
@@ -0,0 +1,168 @@
+"""
+Where the memory goes.
+
+Surfaces are counted by walking the objects that own them, grouped by owner
+category. A surface reachable from several owners is counted once, in the
+first category that reaches it, and subsurfaces are charged to their parent
+sheet. Python allocations come from tracemalloc, which only records
+allocations made after tracing started (settings.TELEMETRY_TRACEMALLOC).
+Snapshots are only taken on demand, because they are slow. Entity counts are
+the lengths of the World's stores.
+
+The debug overlay (F3) shows a summary and F4 writes everything to
+settings.TELEMETRY_PATH as JSON.
+"""
+import json
+import os
+import tracemalloc
+from itertools import chain
+
+import settings
+from src import animation
+
+# World stores whose lengths are reported as entity counts
+ENTITY_STORES = (
+    "enemies", "astral_shards", "objects", "projectiles", "bullets", "obstacles", "floating_texts", "particles",
+)
+
+
+def start_tracing():
+    if settings.TELEMETRY_TRACEMALLOC and not tracemalloc.is_tracing():
+        tracemalloc.start(settings.TELEMETRY_TRACEMALLOC_FRAMES)
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+def surface_owners(game):
+    """(category, iterable of surfaces) for everything that holds surfaces."""
+    world = game.world
+    projectiles = chain(game.weapon_manager.projectiles, world.projectiles)
+    clip_sets = animation._clip_sets.values()
+    shop, ui, minimap = game.shop, game.ui, game.minimap
+    # Headless games have no display or render target
+    render_surface = getattr(game, "render_surface", None)
+    return [
+        ("render target", [render_surface] if render_surface is not getattr(game, "screen", None) else []),
+        ("background", [world.surface, world.tile_sprite]),
+        ("animation frames", chain.from_iterable(
+            chain.from_iterable(chain(clips.frames, clips.flipped)) for clips in clip_sets
+        )),
+        ("projectiles", chain.from_iterable(
+            (projectile.image, projectile.original_image) for projectile in projectiles
+        )),
+        ("bullets", world.bullets.textures),
+        ("weapons", [game.weapon_manager.active_weapon.image] if game.weapon_manager.active_weapon else []),
+        ("shards", [world.astral_shards.image]),
+        ("floating text", chain.from_iterable(
+            (text.rendered, text.surface) for text in world.floating_texts
+        )),
+        ("particles", world.particles.textures or []),
+        ("items", chain(
+            (item.image for item in game.consumable_manager.consumables.values()),
+            (item.image for item in game.player.inventory.consumables if item),
+        )),
+        ("hud", [ui.astral_shard_image, shop.astral_shard_image] + (
+            [minimap.terrain, minimap.surface] if minimap else []
+        )),
+    ]
+
+
+def surface_census(game):
+    """{category: {"count": live surfaces, "bytes": pixel bytes}}"""
+    seen = set()
+    census = {}
+    for category, surfaces in surface_owners(game):
+        count = total = 0
+        for surface in surfaces:
+            if surface is None:
+                continue
+            # Subsurfaces share their parent's pixels
+            while surface.get_parent() is not None:
+                surface = surface.get_parent()
+            if id(surface) in seen:
+                continue
+            seen.add(id(surface))
+            count += 1
+            total += surface_bytes(surface)
+        census[category] = {"count": count, "bytes": total}
+    return census
+
+
+def entity_counts(game):
+    counts = {name: len(getattr(game.world, name)) for name in ENTITY_STORES}
+    counts["player_projectiles"] = len(game.weapon_manager.projectiles)
+    return counts
+
+
+def python_allocations(limit=20):
+    """
+    Live Python allocations since tracing started: totals per source file
+    (the subsystem) and the top `limit` allocation sites. None if not tracing.
+    """
+    if not tracemalloc.is_tracing():
+        return None
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    current, peak = tracemalloc.get_traced_memory()
+    root = os.getcwd()
+    relative = lambda path: os.path.relpath(path, root) if path.startswith(root) else path
+    return {
+        "current_bytes": current,
+        "peak_bytes": peak,
+        "by_file": {
+            relative(stat.traceback[0].filename): {"count": stat.count, "bytes": stat.size}
+            for stat in snapshot.statistics("filename")[:limit]
+        },
+        "top_lines": [
+            {"site": f"{relative(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+             "count": stat.count, "bytes": stat.size}
+            for stat in snapshot.statistics("lineno")[:limit]
+        ],
+    }
+
+
+def collect(game):
+    return {
+        "game_time": game.timer.get_time(),
+        "surfaces": surface_census(game),
+        "entities": entity_counts(game),
+        "python": python_allocations(),
+    }
+
+
+def dump(game, path):
+    with open(path, "w") as f:
+        json.dump(collect(game), f, indent=2)
+    print(f"Memory telemetry written to {path}.")
+
+
+class TelemetryOverlay:
+    """Debug overlay lines, with the surface census refreshed every `interval` ticks."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.census = None
+        self.census_tick = None
+
+    def lines(self, game):
+        tick = game.world.tick
+        if self.census_tick is None or not 0 <= tick - self.census_tick < self.interval:
+            self.census = surface_census(game)
+            self.census_tick = tick
+        count = sum(entry["count"] for entry in self.census.values())
+        total = sum(entry["bytes"] for entry in self.census.values())
+        lines = [f"Surfaces: {count}, {total / 2**20:.1f} MB"]
+        largest = sorted(self.census.items(), key=lambda item: item[1]["bytes"], reverse=True)[:4]
+        lines.extend(
+            f"  {category}: {entry['count']}, {entry['bytes'] / 2**20:.1f} MB" for category, entry in largest
+        )
+        entities = entity_counts(game)
+        lines.append("Entities: " + ", ".join(f"{name.replace('_', ' ')} {count}" for name, count in entities.items() if count))
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            lines.append(f"Python heap: {current / 2**20:.1f} MB (peak {peak / 2**20:.1f} MB)")
+        return lines
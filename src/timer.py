@@ -1,26 +1,32 @@
-import pygame
+from src.clock import game_clock
 
 class Timer:
-    def __init__(self):
-        self.start_time = 0
-        self.elapsed_time = 0
+    """
+    Time played in the current run, on top of the game clock. Stopping the
+    timer pauses the game clock, so everything that reads game time (buffs,
+    cooldowns, invincibility, demons, waves) pauses with it.
+    """
+    def __init__(self, clock=game_clock):
+        self.clock = clock
+        self.origin = clock.game_time
         self.running = False
 
     def start(self):
         self.running = True
-        self.start_time = pygame.time.get_ticks() - self.elapsed_time
+        self.clock.resume()
 
     def stop(self):
         if self.running:
             self.running = False
-            self.elapsed_time = pygame.time.get_ticks() - self.start_time
+            self.clock.pause()
 
     def reset(self):
-        self.start_time = 0
-        self.elapsed_time = 0
-        self.running = False
+        self.stop()
+        self.origin = self.clock.game_time
+
+    def set_time(self, seconds):
+        """Jump to `seconds` of play, e.g. when resuming a saved run."""
+        self.origin = self.clock.game_time - seconds
 
     def get_time(self):
-        if self.running:
-            return (pygame.time.get_ticks() - self.start_time) / 1000
-        return self.elapsed_time / 1000
+        return self.clock.game_time - self.origin
@@ -0,0 +1,131 @@
+"""
+Per-tick world state trace written to a memory-mapped file.
+
+Each tick fills one fixed-size record in a preallocated ring buffer: entity
+counts, the player, per-subsystem timings and the positions/HP of the first
+`max_enemies` enemies. The OS owns the mapped pages, so the last ticks before
+a crash are still on disk. Read a trace back with load_trace():
+
+    python -m src.trace trace.bin
+"""
+import struct
+import sys
+from itertools import chain, islice
+
+import numpy as np
+
+MAGIC = b"ASTR"
+VERSION = 1
+# magic, version, capacity, max_enemies, stage name bytes, ticks written
+HEADER = struct.Struct("<4sHIIIQ")
+HEADER_SIZE = 4096
+TICKS_WRITTEN_OFFSET = HEADER.size - 8
+
+
+def record_dtype(stage_names, max_enemies):
+    return np.dtype([
+        ("tick", "<u4"),
+        ("game_time", "<f4"),
+        ("frame_ms", "<f4"),
+        ("enemy_count", "<u4"),
+        ("projectile_count", "<u4"),
+        ("shard_count", "<u4"),
+        ("text_count", "<u4"),
+        ("player_x", "<f4"),
+        ("player_y", "<f4"),
+        ("player_hp", "<f4"),
+        *[(f"stage_{name}", "<f4") for name in stage_names],
+        ("enemy_xy", "<f4", (max_enemies, 2)),
+        ("enemy_hp", "<f4", (max_enemies,)),
+    ])
+
+
+class TickTracer:
+    def __init__(self, path, stage_names, capacity, max_enemies):
+        self.stage_names = list(stage_names)
+        self.stage_fields = [f"stage_{name}" for name in self.stage_names]
+        self.capacity = capacity
+        self.max_enemies = max_enemies
+        dtype = record_dtype(self.stage_names, max_enemies)
+
+        names = ",".join(self.stage_names).encode("ascii")
+        self.file = np.memmap(path, dtype=np.uint8, mode="w+", shape=(HEADER_SIZE + capacity * dtype.itemsize,))
+        self.file[:HEADER.size] = np.frombuffer(
+            HEADER.pack(MAGIC, VERSION, capacity, max_enemies, len(names), 0), np.uint8
+        )
+        self.file[HEADER.size:HEADER.size + len(names)] = np.frombuffer(names, np.uint8)
+        self.ticks_written = self.file[TICKS_WRITTEN_OFFSET:HEADER.size].view("<u8")
+        self.records = self.file[HEADER_SIZE:].view(dtype)
+        self.count = 0
+
+    def record(self, game, frame_ms):
+        """Write this tick's record in place; nothing is kept on the Python side."""
+        record = self.records[self.count % self.capacity]
+        world, player = game.world, game.player
+        enemies = world.enemies
+
+        record["tick"] = world.tick
+        record["game_time"] = game.timer.get_time()
+        record["frame_ms"] = frame_ms
+        record["enemy_count"] = len(enemies)
+        record["projectile_count"] = len(game.weapon_manager.projectiles)
+        record["shard_count"] = len(world.astral_shards)
+        record["text_count"] = len(world.floating_texts)
+        record["player_x"] = player.position.x
+        record["player_y"] = player.position.y
+        record["player_hp"] = player.hp
+        stage_times = game.stage_times
+        for name, field in zip(self.stage_names, self.stage_fields):
+            record[field] = stage_times.get(name, 0.0)
+
+        count = min(len(enemies), self.max_enemies)
+        enemy_xy, enemy_hp = record["enemy_xy"], record["enemy_hp"]
+        enemy_xy.reshape(-1)[:2 * count] = np.fromiter(
+            chain.from_iterable(enemy.position for enemy in islice(enemies, count)), np.float32, 2 * count
+        )
+        enemy_hp[:count] = np.fromiter((enemy.hp for enemy in islice(enemies, count)), np.float32, count)
+        enemy_xy[count:] = np.nan
+        enemy_hp[count:] = np.nan
+
+        self.count += 1
+        self.ticks_written[0] = self.count
+
+    def close(self):
+        self.file.flush()
+        del self.records, self.ticks_written, self.file
+
+
+def load_trace(path):
+    """
+    Load a trace as a NumPy structured array in chronological order, plus the
+    stage names (their timings are in the `stage_<name>` fields).
+    """
+    raw = np.memmap(path, dtype=np.uint8, mode="r")
+    magic, version, capacity, max_enemies, names_length, written = HEADER.unpack(raw[:HEADER.size].tobytes())
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a tick trace.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported trace version {version} (expected {VERSION}).")
+    names = raw[HEADER.size:HEADER.size + names_length].tobytes().decode("ascii")
+    stage_names = names.split(",") if names else []
+
+    dtype = record_dtype(stage_names, max_enemies)
+    records = raw[HEADER_SIZE:HEADER_SIZE + capacity * dtype.itemsize].view(dtype)
+    if written <= capacity:
+        return np.array(records[:written]), stage_names
+    # The ring buffer wrapped: the oldest record is the one after the newest
+    start = written % capacity
+    return np.concatenate((records[start:], records[:start])), stage_names
+
+
+if __name__ == "__main__":
+    trace, stage_names = load_trace(sys.argv[1] if len(sys.argv) > 1 else "trace.bin")
+    if len(trace) == 0:
+        print("Trace is empty.")
+        raise SystemExit
+    print(f"{len(trace)} ticks, game time {trace['game_time'][0]:.1f}s - {trace['game_time'][-1]:.1f}s")
+    print(f"frame ms: mean {trace['frame_ms'].mean():.2f}, max {trace['frame_ms'].max():.2f}")
+    print(f"enemies: max {trace['enemy_count'].max()}, final player hp {trace['player_hp'][-1]:.0f}")
+    for name in stage_names:
+        times = trace[f"stage_{name}"]
+        print(f"  {name:>10}: mean {times.mean():.2f} ms, max {times.max():.2f} ms")
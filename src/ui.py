@@ -1,5 +1,4 @@
 import pygame
-import settings
 
 class UI:
     def __init__(self, font, wave_manager,player,large_font=None,):
@@ -8,6 +7,8 @@ class UI:
         self.wave_manager = wave_manager
         self.large_font = large_font or pygame.font.Font("assets/fonts/dogicapixel.ttf", 32)
         self.small_font = pygame.font.Font("assets/fonts/dogicapixel.ttf", 12)
+        astral_shard_image = pygame.image.load("assets/images/items/astral_shard.png").convert_alpha()
+        self.astral_shard_image = pygame.transform.scale(astral_shard_image, (32, 32))
         self.elapsed_pause_time = 0
         self.pause_start_time = None
 
@@ -15,7 +16,8 @@ class UI:
         slot_size = 50
         padding = 10
         
-        x, y = settings.WIDTH // 2 - 5*slot_size - 5*padding , settings.HEIGHT - slot_size - padding*2
+        width, height = screen.get_size()
+        x, y = width // 2 - 5*slot_size - 5*padding , height - slot_size - padding*2
 
         for i, consumable in enumerate(inventory.consumables):
             slot_x = x + i * (slot_size + padding)
@@ -48,19 +50,24 @@ class UI:
             f"Wave: {self.wave_manager.current_wave['wave_number']}"
             # f"Astral Shards: {player.astral_shards}",
         ]
-        x, y = 20, settings.HEIGHT - 150
+        x, y = 20, screen.get_height() - 150
         for i, stat in enumerate(stats):
             text = self.small_font.render(stat, False, (255, 255, 255))
             screen.blit(text, (x, y + i * 20))
 
+    def draw_debug_overlay(self, screen, lines):
+        x, y = 20, 20
+        for i, line in enumerate(lines):
+            text = self.small_font.render(line, False, (255, 255, 0))
+            screen.blit(text, (x, y + i * 20))
+
     def draw_shards(self, screen, player):
         shards = player.astral_shards
-        astral_shard_image = pygame.image.load("assets/images/items/astral_shard.png").convert_alpha()  
-        astral_shard_image = pygame.transform.scale(astral_shard_image, (32, 32)) 
-        x, y = settings.WIDTH // 2 + 250 + 50 + 60 , settings.HEIGHT - 50
+        width, height = screen.get_size()
+        x, y = width // 2 + 250 + 50 + 60 , height - 50
         text = self.font.render(f"{int(shards)}", False, (255, 255, 255))
         screen.blit(text, (x, y))
-        screen.blit(astral_shard_image, (x - 40, y - 10 ))
+        screen.blit(self.astral_shard_image, (x - 40, y - 10 ))
 
     def draw_game_time(self, screen, timer):
         total_seconds = int(timer.get_time())
@@ -68,5 +75,5 @@ class UI:
         seconds = total_seconds % 60
         time_text = f"{minutes:02}:{seconds:02}"
         text_surface = self.large_font.render(time_text, True, (255, 255, 255))
-        text_rect = text_surface.get_rect(center=(settings.WIDTH // 2, 40))
+        text_rect = text_surface.get_rect(center=(screen.get_width() // 2, 40))
         screen.blit(text_surface, text_rect)
@@ -1,7 +1,8 @@
 import pygame
+import copy
 import json
 import random
-from src.enemy import Enemy, Demon
+from src.enemy import create_enemy
 
 class WaveManager:
     def __init__(self, wave_file, world, enemy_data, enemy_manager, camera, timer):
@@ -11,11 +12,15 @@ class WaveManager:
         self.enemy_data = enemy_data
         self.enemy_manager = enemy_manager
         self.timer = timer
-        self.waves = self.load_waves(wave_file)
+        # Spawning counts the groups down, so each run works on a copy
+        self.wave_definitions = self.load_waves(wave_file)
+        self.waves = copy.deepcopy(self.wave_definitions)
         self.current_wave = None
         self.wave_index = 0
         self.enemies_spawned = 0
         self.wave_start_offset = 0
+        # Whether the last wave to end was killed out (True) or timed out (False)
+        self.last_wave_cleared = None
 
     def load_waves(self, wave_file):
         with open(wave_file, "r") as f:
@@ -33,11 +38,12 @@ class WaveManager:
             print("No more waves.")
 
     def reset(self):
-        self.waves = self.load_waves(self.wave_file)
+        self.waves = copy.deepcopy(self.wave_definitions)
         self.wave_index = 0
         self.current_wave = None
         self.enemies_spawned = 0
         self.wave_start_offset = 0
+        self.last_wave_cleared = None
 
     def update(self):
         """Updates the status of the wave, spawns enemies if needed, 
@@ -50,12 +56,12 @@ class WaveManager:
 
         # 1. Check if the wave duration has ended
         if elapsed_time >= self.current_wave["duration"]:
-            self.end_wave()
+            self.end_wave(cleared=False)
             return
 
         # 2. Check if all enemies are spawned AND there are no enemies alive
         if all(enemy_group["count"] <= 0 for enemy_group in self.current_wave["enemies"]) and len(self.world.enemies) == 0:
-            self.end_wave()
+            self.end_wave(cleared=True)
             return
 
         # Calculate spawn interval based on the spawn_rate
@@ -72,7 +78,6 @@ class WaveManager:
             if enemy_group["count"] > 0:
                 enemy_type = enemy_group["type"]
                 if enemy_type in self.enemy_data:
-                    enemy_properties = self.enemy_data[enemy_type]
                     camera_offset = self.camera.offset
                     spawn_zone = random.choice(["top", "bottom", "left", "right"])
 
@@ -98,18 +103,16 @@ class WaveManager:
                     y = max(0, min(y, self.world.height))
 
                     # Create the appropriate enemy subclass
-                    if enemy_type == "demon" or enemy_type == "magma_demon" or enemy_type == "lunar_mage" or enemy_type == "magma_demon":
-                        enemy = Demon(x, y, enemy_properties, self.world)
-                    else:
-                        enemy = Enemy(x, y, enemy_properties, self.world)
+                    enemy = create_enemy(enemy_type, x, y, self.enemy_data, self.world)
 
-                    self.world.enemies.append(enemy)
+                    self.world.add_enemy(enemy)
                     enemy_group["count"] -= 1
                     print(f"Spawned {enemy_type} at ({x}, {y}).")
                     return
 
-    def end_wave(self):
-        """Ends the current wave and starts the next wave."""
-        print(f"Wave {self.current_wave['wave_number']} ended.")
+    def end_wave(self, cleared):
+        """Ends the current wave (`cleared`: every enemy killed, not timed out) and starts the next wave."""
+        print(f"Wave {self.current_wave['wave_number']} {'cleared' if cleared else 'timed out'}.")
+        self.last_wave_cleared = cleared
         self.current_wave = None
         self.start_wave(self.wave_index + 1)
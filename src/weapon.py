@@ -2,8 +2,45 @@ import pygame
 import json
 import random
 import math
+import weakref
+import settings
+from src.clock import game_clock
 from src.player import Player
 
+# Projectile sprites are drawn and hit-tested at headings rounded to this
+# many degrees, so rotated images and their masks can be shared
+ROTATION_STEP = 5
+
+# Per projectile image: [(rotated image, its mask) for every heading bucket]
+_rotations = weakref.WeakKeyDictionary()
+
+
+def register_projectile_image(image):
+    """
+    Build every rotation of `image` and its mask at once, so the first hit
+    at each angle doesn't pay for building a mask mid-frame (building one
+    also locks its surface, which another thread may be blitting, see
+    benchmarks/pipelined_simulation.py).
+    """
+    sprites = _rotations.get(image)
+    if sprites is None:
+        sprites = _rotations[image] = []
+        for bucket in range(360 // ROTATION_STEP):
+            rotated = pygame.transform.rotate(image, -bucket * ROTATION_STEP)
+            sprites.append((rotated, pygame.mask.from_surface(rotated)))
+    return sprites
+
+
+def rotated_sprite(image, angle):
+    """`image` turned to `angle` degrees (clockwise) and its mask."""
+    sprites = register_projectile_image(image)
+    return sprites[round(angle / ROTATION_STEP) % len(sprites)]
+
+
+def is_alive(target):
+    return target.hp > 0
+
+
 class Weapon:
     def __init__(self, properties, player):
         self.player = player
@@ -19,25 +56,52 @@ class Weapon:
             self.image,
             (int(original_width * properties["scale"]), int(original_height * properties["scale"]))
         )
+        register_projectile_image(self.image)
         self.cooldown = 1 / self.fire_rate
-        self.last_shot_time = 0
+        self.last_shot_time = float("-inf")  # ready to fire straight away
+        # "mouse" fires at the given target, "nearest" at the closest enemy in range
+        self.targeting = properties.get("targeting", "mouse")
+        # Degrees per tick a projectile turns toward the closest enemy within
+        # homing_range (0: flies straight)
+        self.homing_turn_rate = properties.get("homing_turn_rate", 0)
+        self.homing_range = properties.get("homing_range", self.range)
+        # Extra enemies a projectile passes through before stopping
+        self.pierce = properties.get("pierce", 0)
+        # Hits damage every enemy within this radius of the impact (0: just the one hit)
+        self.explosion_radius = properties.get("explosion_radius", 0)
 
     def can_fire(self):
-        current_time = pygame.time.get_ticks() / 1000
+        current_time = game_clock.game_time
         effective_fire_rate = self.fire_rate * self.player.attack_speed
         cooldown = 1 / effective_fire_rate
         return current_time - self.last_shot_time >= cooldown
 
     def fire(self, position, target_position, projectiles):
-        if self.can_fire():
-            self.last_shot_time = pygame.time.get_ticks() / 1000
-            projectile = Projectile(
-                position, target_position, self.projectile_speed + self.player.movement_speed ,
-                self.damage * self.player.ability_power,
-                self.range * self.player.attack_range,
-                self.image
-            )
-            projectiles.append(projectile)
+        if not self.can_fire():
+            return
+        max_range = self.range * self.player.attack_range
+        if self.targeting == "nearest":
+            # Hold fire (and the cooldown) until something is in range
+            nearest = self.player.world.nearest_enemies(position, 1, max_range)
+            if not nearest or nearest[0].position == position:
+                return
+            target_position = nearest[0].position
+        self.last_shot_time = game_clock.game_time
+        projectile = Projectile(
+            position, target_position, self.projectile_speed + self.player.movement_speed ,
+            self.damage * self.player.ability_power,
+            max_range,
+            self.image
+        )
+        self.configure(projectile)
+        projectiles.append(projectile)
+
+    def configure(self, projectile):
+        """Give `projectile` this weapon's homing, pierce and explosion."""
+        projectile.homing_turn_rate = self.homing_turn_rate
+        projectile.homing_range = self.homing_range * self.player.attack_range
+        projectile.pierce = self.pierce
+        projectile.explosion_radius = self.explosion_radius
 
 class Projectile:
     def __init__(self, position, target_position, speed, damage, range, image):
@@ -50,19 +114,122 @@ class Projectile:
         self.range = range
         self.original_image = image
         self.angle = math.degrees(math.atan2(self.direction.y, self.direction.x))
-        self.image = pygame.transform.rotate(self.original_image, -self.angle)
+        self.image, self.mask = rotated_sprite(self.original_image, self.angle)
         self.rect = self.image.get_rect(center=self.position)
+        self.homing_turn_rate = 0
+        self.homing_range = 0
+        self.pierce = 0
+        self.explosion_radius = 0
+        self.struck = set()  # targets a piercing projectile has already hit
 
-    def update(self, targets):
-        self.position += self.direction * self.speed
+    def update(self, targets=(), broadphase=None, particles=None, damage=None):
+        """
+        Move one step and hit the first target along the way (or the first
+        few, for piercing projectiles). The whole segment travelled this tick
+        is tested, so fast shots can't tunnel through small targets. With a
+        `broadphase` index, only the targets near that segment are tested.
+        Impacts are splashed into `particles`, and hits go into the `damage`
+        queue if there is one. Homing projectiles also find their target
+        through the broadphase. The step that would leave the range is cut
+        short at its edge, tested like any other, and then the projectile
+        expires.
+        """
+        if self.homing_turn_rate and broadphase is not None:
+            self.steer(broadphase)
+        previous_position = pygame.math.Vector2(self.position)
+        step = self.speed
+        offset = previous_position - self.start_position
+        expired = (offset + self.direction * step).length_squared() > self.range ** 2
+        if expired:
+            # How far along the direction the range circle is crossed
+            along = offset.dot(self.direction)
+            step = max(0.0, -along + math.sqrt(max(0.0, along * along - offset.length_squared() + self.range ** 2)))
+        self.position += self.direction * step
         self.rect.center = self.position
-        if self.position.distance_to(self.start_position) > self.range:
-            return False
-        for target in targets:
-            if self.rect.colliderect(target.rect):
-                target.take_damage(self.damage)
+        if broadphase is not None:
+            swept_rect = self.rect.union(self.rect.move(previous_position - self.position))
+            targets = broadphase.query_rect(swept_rect)
+        for target in self.hits_along(previous_position, targets):
+            self.strike(target, broadphase, particles, damage)
+            if not self.pierce:
                 return False
-        return True
+            self.pierce -= 1
+            self.struck.add(target)
+        return not expired
+
+    def strike(self, target, broadphase=None, particles=None, damage=None):
+        """Damage `target`, or everything in the blast for exploding projectiles."""
+        victims = (target,)
+        if particles is not None:
+            particles.impact(self.position, self.direction)
+        if self.explosion_radius and broadphase is not None:
+            victims = broadphase.query_radius(self.position, self.explosion_radius, accept=is_alive)
+            # The radius query tests centres, so a large target struck at
+            # its edge may be outside its own blast
+            if target not in victims:
+                victims.append(target)
+            if particles is not None:
+                particles.explosion(self.position, self.explosion_radius)
+        if damage is not None:
+            damage.add_many(victims, self.damage)
+        else:
+            for victim in victims:
+                victim.take_damage(self.damage)
+
+    def steer(self, broadphase):
+        """Turn toward the closest living target in homing range, retargeting every tick."""
+        nearest = broadphase.nearest(self.position, 1, self.homing_range, accept=is_alive)
+        if not nearest:
+            return
+        wanted = nearest[0].position - self.position
+        if wanted.length_squared() == 0:
+            return
+        turn = (self.direction.angle_to(wanted) + 180) % 360 - 180
+        self.direction.rotate_ip(max(-self.homing_turn_rate, min(self.homing_turn_rate, turn)))
+        self.angle = math.degrees(math.atan2(self.direction.y, self.direction.x))
+        image, self.mask = rotated_sprite(self.original_image, self.angle)
+        if image is not self.image:
+            self.image = image
+            self.rect = image.get_rect(center=self.position)
+
+    def hits_along(self, previous_position, targets):
+        """
+        Targets hit on the way from `previous_position` to the current
+        position, nearest first. Growing each target rect by our own size
+        turns the moving rect into a point, and `clipline` gives where the
+        segment enters and leaves it. Targets with a mask are then only hit
+        if our pixels touch theirs somewhere along that stretch.
+        """
+        hits = []
+        for target in targets:
+            if target.hp <= 0 or target in self.struck:
+                continue
+            expanded = target.rect.inflate(self.rect.width, self.rect.height)
+            clipped = expanded.clipline(previous_position, self.position)
+            if clipped and self.touches(target, *clipped):
+                hits.append((previous_position.distance_squared_to(clipped[0]), target))
+        if len(hits) > 1:
+            hits.sort(key=lambda hit: hit[0])
+        return [target for _, target in hits]
+
+    def touches(self, target, start, end):
+        """
+        Pixel test against `target` with our centre moving from `start` to
+        `end`, sampled about every half our size so thin shapes aren't skipped.
+        """
+        if not settings.COLLISION_MASKS_ENABLED or not hasattr(target, "mask"):
+            return True
+        target_mask = target.mask()
+        left, top = target.rect.topleft
+        width, height = self.rect.size
+        (x0, y0), (x1, y1) = start, end
+        steps = max(1, math.ceil(math.hypot(x1 - x0, y1 - y0) / max(1, min(width, height) / 2)))
+        for i in range(steps + 1):
+            x = x0 + (x1 - x0) * i / steps
+            y = y0 + (y1 - y0) * i / steps
+            if target_mask.overlap(self.mask, (round(x - width / 2 - left), round(y - height / 2 - top))):
+                return True
+        return False
 
     def draw(self, screen, camera):
         screen_position = camera.apply(self.rect)
@@ -72,6 +239,7 @@ class WeaponManager:
     def __init__(self, weapon_data_file, player, projectiles):
         self.weapon_data = self.load_weapon_data(weapon_data_file)
         self.active_weapon = None
+        self.active_weapon_name = None
         self.projectiles = projectiles
         self.player = player
 
@@ -82,11 +250,22 @@ class WeaponManager:
     def equip_weapon(self, weapon_name):
         if weapon_name in self.weapon_data:
             self.active_weapon = Weapon(self.weapon_data[weapon_name], self.player)
+            self.active_weapon_name = weapon_name
         else:
             raise ValueError(f"Weapon '{weapon_name}' not found in weapon data.")
 
-    def update(self, enemies):
-        self.projectiles = [p for p in self.projectiles if p.update(enemies)]
+    def reset(self, weapon_name):
+        """Drop live projectiles and hold `weapon_name`, ready to fire."""
+        self.projectiles = []
+        if weapon_name == self.active_weapon_name:
+            self.active_weapon.last_shot_time = float("-inf")
+        else:
+            self.equip_weapon(weapon_name)
+
+    def update(self, enemies, enemy_index=None):
+        world = self.player.world
+        self.projectiles = [p for p in self.projectiles if p.update(enemies, enemy_index, world.particles, world.damage)]
+        world.damage.flush()
 
     def draw(self, screen, camera):
         for projectile in self.projectiles:
@@ -1,32 +1,124 @@
+import random
+from itertools import chain
+
+import numpy as np
 import pygame
-from src.floating_text import FloatingText
+from src.animation import advance_animations
+from src.astral_shard import AstralShards
+from src.bullets import BulletSystem
+from src.clock import game_clock
+from src.damage import DamageQueue, positions_of
+from src.floating_text import FloatingText, FloatingTextManager
 from src.enemy import EnemyManager, load_enemy_data, spawn_enemy, Demon
+from src.flow_field import FlowField
+from src.particles import ParticleSystem
+from src.spatial_grid import SpatialGrid, candidate_pairs, cross_pairs
 from settings import *
 
+def is_alive(enemy):
+    return enemy.hp > 0
+
+
+def separation_pairs(positions, radii):
+    """
+    Index pairs (first, second) of enemies close enough that they might
+    overlap. Only adjacent cells are compared, so a cell must span the widest
+    overlap: enemies up to half ENEMY_SEPARATION_CELL_SIZE in radius are
+    paired on that grid, and the few larger ones get a coarser grid of their
+    own, sized to them, that the rest are looked up in.
+    """
+    cell_size = ENEMY_SEPARATION_CELL_SIZE
+    large = radii > cell_size / 2
+    if not large.any():
+        return candidate_pairs(positions, cell_size)
+
+    small_index, large_index = np.flatnonzero(~large), np.flatnonzero(large)
+    small_positions, large_positions = positions[small_index], positions[large_index]
+    largest = float(radii[large_index].max())
+    first, second = candidate_pairs(small_positions, cell_size)
+    large_first, large_second = candidate_pairs(large_positions, 2 * largest)
+    cross_first, cross_second = cross_pairs(small_positions, large_positions, largest + cell_size / 2)
+    return (
+        np.concatenate((small_index[first], large_index[large_first], small_index[cross_first])),
+        np.concatenate((small_index[second], large_index[large_second], large_index[cross_second])),
+    )
+
+
 class World:
     def __init__(self, width, height, player, timer):
         self.width = width
         self.height = height
         self.player = player
         self.timer = timer
-        self.surface = pygame.Surface((width, height))
+        # The tiled background is only built on the first draw, so headless
+        # simulations never allocate the full-size world surface
+        self.surface = None
         self.tile_sprite = pygame.image.load("assets/images/backgrounds/grass_512x512.png").convert()
         self.objects = []
         self.dynamic_objects = []
         self.enemies = []
-        self.astral_shards = []
-        self.floating_texts = []
+        self.astral_shards = AstralShards()
+        self.floating_texts = FloatingTextManager(FLOATING_TEXT_LIMIT, FLOATING_TEXT_MERGE_WINDOW)
+        self.particles = ParticleSystem(PARTICLE_LIMIT, game_clock.game_time)
+        self.projectiles = []
+        # Hostile bullets from every enemy, hitting the player
+        self.bullets = BulletSystem(BULLET_LIMIT)
+
+        # Distance-based update LOD for far-away enemies
+        self.enemy_lod = ENEMY_LOD_ENABLED
+        self.set_lod_interval_scale(1)
+        self.show_enemy_health_bars = True
+        self.tick = 0
+        self.enemy_serial = 0
+
+        # Shared path directions toward the player, plus terrain to path around
+        self.flow_field = FlowField(width, height, FLOW_FIELD_CELL_SIZE)
+        self.obstacles = []
+
+        # Crowd separation between enemies
+        self.enemy_separation = ENEMY_SEPARATION_ENABLED
+
+        # Broadphase index of enemies, rebuilt at most once per tick on demand
+        self.enemy_index = SpatialGrid(ENEMY_INDEX_CELL_SIZE)
+        self.enemy_index_tick = -1
+
+        # Hits on enemies, applied together once per tick
+        self.damage = DamageQueue(self)
+
+    def reset(self):
+        """
+        Empty the world for a new run. The background, obstacles, flow field
+        and the particle, bullet and text stores are kept.
+        """
+        self.objects = []
+        self.enemies = []
+        self.astral_shards.clear()
         self.projectiles = []
-        self.generate_tiled_background()
+        self.bullets.clear()
+        self.floating_texts.clear()
+        self.damage.clear()
+        self.particles.clear()
+        self.particles.last_time = game_clock.game_time
+        self.tick = 0
+        self.enemy_serial = 0
+        self.enemy_index_tick = -1
 
     def add_enemy(self, enemy):
+        enemy.lod_bucket = self.enemy_serial
+        self.enemy_serial += 1
         self.enemies.append(enemy)
 
     def remove_enemy(self, enemy):
         if enemy in self.enemies:
             self.enemies.remove(enemy)
 
+    def add_obstacle(self, rect):
+        """Add terrain that enemies path around."""
+        self.obstacles.append(rect)
+        self.flow_field.add_obstacle(rect)
+
     def generate_tiled_background(self):
+        self.surface = pygame.Surface((self.width, self.height))
         tile_width = self.tile_sprite.get_width()
         tile_height = self.tile_sprite.get_height()
         for y in range(0, self.height, tile_height):
@@ -35,22 +127,33 @@ class World:
 
     def add_floating_text(self, text, target, offset, color, duration=0.5, font=None):
         floating_text = FloatingText(text, target, offset, color, duration, font)
-        self.floating_texts.append(floating_text)
+        self.floating_texts.add(floating_text)
 
-    def check_shard_collection(self, player):
-        for shard in self.astral_shards[:]:
-            if shard.rect.colliderect(player.rect):
-                player.collect_astral_shard()
-                self.remove_astral_shard(shard)
+    def add_damage_number(self, amount, target, color, offset=(0, -20), duration=0.5):
+        """Show `amount` over `target`, merged with its other recent numbers."""
+        self.floating_texts.add_number(amount, target, offset, color, duration)
+
+    def add_damage_numbers(self, targets, amounts, color, offset=(0, -20), duration=0.5):
+        self.floating_texts.add_numbers(amounts, targets, offset, color, duration)
 
-    def add_astral_shard(self, astral_shard):
-        self.astral_shards.append(astral_shard)
-        self.add_object(astral_shard)
+    def drop_astral_shards(self, enemies):
+        """Drop each enemy's astral shards within 20 pixels of where it stands."""
+        counts = np.fromiter((enemy.astral_shards_drop for enemy in enemies), np.intp, len(enemies))
+        total = int(counts.sum())
+        if not total:
+            return
+        # Seeded from `random` so seeded runs stay reproducible
+        rng = np.random.default_rng(random.getrandbits(64))
+        positions = np.repeat(positions_of(enemies), counts, axis=0) + rng.integers(-20, 21, (total, 2))
+        np.clip(positions, 0, (self.width, self.height), out=positions)
+        self.astral_shards.add(positions)
+
+    def check_shard_collection(self, player):
+        for _ in range(self.astral_shards.collect(player.rect)):
+            player.collect_astral_shard()
 
-    def remove_astral_shard(self, astral_shard):
-        if astral_shard in self.astral_shards:
-            self.astral_shards.remove(astral_shard)
-        self.remove_object(astral_shard)
+    def add_astral_shard(self, x, y):
+        self.astral_shards.add((x, y))
 
     def add_object(self, obj):
         self.objects.append(obj)
@@ -60,30 +163,140 @@ class World:
             self.objects.remove(obj)
 
     def draw(self, screen, camera):
+        if self.surface is None:
+            self.generate_tiled_background()
         screen.blit(self.surface, (-camera.offset.x, -camera.offset.y))
         for obj in self.objects:
             obj.draw(screen, camera)
+        self.astral_shards.draw(screen, camera)
         for enemy in self.enemies:
             enemy.draw(screen, camera)
+        self.bullets.draw(screen, camera)
+        self.particles.draw(screen, camera)
         for text in self.floating_texts:
             text.draw(screen, camera)
 
+    def set_lod_interval_scale(self, scale):
+        """Update far-tier enemies `scale` times less often than configured."""
+        self.enemy_lod_tiers = [(radius * radius, interval * scale) for radius, interval in ENEMY_LOD_TIERS]
+
+    def get_enemy_update_steps(self, enemy):
+        """
+        How many ticks of movement `enemy` should catch up on this tick.
+        Enemies in a far tier return `interval` once every `interval` ticks
+        (staggered by their bucket) and 0 otherwise.
+        """
+        if not self.enemy_lod:
+            return 1
+        distance_sq = self.player.position.distance_squared_to(enemy.position)
+        interval = 1
+        for radius_sq, tier_interval in self.enemy_lod_tiers:
+            if distance_sq > radius_sq:
+                interval = tier_interval
+        if interval == 1:
+            return 1
+        return interval if (self.tick + enemy.lod_bucket) % interval == 0 else 0
+
+    def get_enemy_index(self):
+        """Spatial index of this tick's enemy positions, built on first use."""
+        if self.enemy_index_tick != self.tick:
+            self.enemy_index.rebuild(self.enemies)
+            self.enemy_index_tick = self.tick
+        return self.enemy_index
+
+    def nearest_enemies(self, position, k=1, max_distance=None):
+        """Up to `k` living enemies closest to `position`, nearest first."""
+        return self.get_enemy_index().nearest(position, k, max_distance, accept=is_alive)
+
+    def enemies_in_radius(self, position, radius):
+        """Living enemies within `radius` of `position`, in no particular order."""
+        return self.get_enemy_index().query_radius(position, radius, accept=is_alive)
+
+    def separate_enemies(self):
+        """
+        Push overlapping enemies apart. Only enemies in the same or adjacent
+        grid cells are compared (see separation_pairs), so the cost stays
+        linear in enemy count.
+        """
+        enemies = self.enemies
+        count = len(enemies)
+        if count < 2:
+            return
+        positions = np.fromiter(
+            chain.from_iterable(enemy.position for enemy in enemies), float, 2 * count
+        ).reshape(count, 2)
+        radii = np.fromiter((enemy.separation_radius for enemy in enemies), float, count)
+
+        first, second = separation_pairs(positions, radii)
+        x, y = positions[:, 0].copy(), positions[:, 1].copy()
+        dx = x[first] - x[second]
+        dy = y[first] - y[second]
+        distance_sq = dx * dx + dy * dy
+        min_distance = radii[first] + radii[second]
+        overlapping = np.flatnonzero(distance_sq < min_distance * min_distance)
+        if len(overlapping) == 0:
+            return
+        first, second = first[overlapping], second[overlapping]
+        dx, dy = dx[overlapping], dy[overlapping]
+        distance_sq, min_distance = distance_sq[overlapping], min_distance[overlapping]
+
+        # Exactly stacked enemies get split along a deterministic per-pair angle
+        stacked = distance_sq == 0
+        if stacked.any():
+            angles = first[stacked] * 2.399963
+            dx[stacked], dy[stacked] = np.cos(angles), np.sin(angles)
+            distance_sq[stacked] = 1.0
+
+        distance = np.sqrt(distance_sq)
+        scale = (min_distance - distance) / distance * (0.5 * ENEMY_SEPARATION_STRENGTH)
+        push_x, push_y = dx * scale, dy * scale
+        new_x = x + np.bincount(first, push_x, count) - np.bincount(second, push_x, count)
+        new_y = y + np.bincount(first, push_y, count) - np.bincount(second, push_y, count)
+
+        moved = np.zeros(count, dtype=bool)
+        moved[first] = True
+        moved[second] = True
+        indices = np.flatnonzero(moved)
+        for index, px, py in zip(indices.tolist(), new_x[indices].tolist(), new_y[indices].tolist()):
+            enemy = enemies[index]
+            enemy.position.update(px, py)
+            enemy.rect.center = (px, py)
+
     def update(self):
+        self.tick += 1
         for obj in self.dynamic_objects:
             obj.update()
+        self.flow_field.update(self.player.position)
         for enemy in self.enemies:
+            steps = self.get_enemy_update_steps(enemy)
             if isinstance(enemy, Demon):
-                enemy.update(self.player.position, self.player, self.timer)
-            else:
-                enemy.update(self.player.position, self.player)
+                # Demons are updated every tick so their jumps play out
+                enemy.update(self.player.position, self.player, steps)
+            elif steps:
+                enemy.update(self.player.position, self.player, steps)
 
-            # Check collision with player
-            if enemy.rect.colliderect(self.player.rect):
+            # Check collision with player (far tiers can't reach the player)
+            if steps == 1 and enemy.rect.colliderect(self.player.rect):
                 self.player.take_damage(enemy.damage)
 
-        self.projectiles = [p for p in self.projectiles if p.update(self.enemies)]
+        if self.enemy_separation:
+            self.separate_enemies()
+
+        self.bullets.update(self.player, self.particles)
+
+        if self.projectiles:
+            enemy_index = self.get_enemy_index()
+            self.projectiles = [
+                p for p in self.projectiles
+                if p.update(broadphase=enemy_index, particles=self.particles, damage=self.damage)
+            ]
+            self.damage.flush()
         self.enemies = [enemy for enemy in self.enemies if enemy.hp > 0]
-        self.floating_texts = [text for text in self.floating_texts if not text.update()]
+        advance_animations(
+            chain((self.player.animation,), (enemy.animation for enemy in self.enemies)), game_clock.game_time
+        )
+        self.particles.update(game_clock.game_time)
+        self.floating_texts.update()
 
     def get_camera_offset(self, player_rect, screen_width, screen_height):
         offset_x = max(0, min(player_rect.centerx - screen_width // 2, self.width - screen_width))
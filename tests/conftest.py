@@ -0,0 +1,24 @@
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+# Asset and config paths are relative to the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def game():
+    """A headless run, a few ticks in."""
+    from src.headless import HeadlessGame, init_headless_display, kite_policy
+
+    init_headless_display()
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = HeadlessGame()
+        for _ in range(10):
+            game.step(kite_policy)
+    return game
@@ -0,0 +1,65 @@
+import math
+
+import pygame
+import pytest
+
+from src.bullets import BulletSystem
+from src.headless import init_headless_display
+
+
+class Target:
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.hits = 0
+
+    def take_damage(self, amount):
+        self.hits += 1
+
+
+@pytest.fixture
+def bullets():
+    init_headless_display()
+    return BulletSystem(16)
+
+
+def fire(bullets, start, end, radius=2):
+    """One bullet covering start -> end in its first tick."""
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    sprite = bullets.sprite("assets/images/projectiles/Fireball1.png", 1)
+    bullets.spawn(start, [math.atan2(dy, dx)], math.hypot(dx, dy), 1000, 10, sprite)
+    bullets.radius[:bullets.count] = radius
+
+
+def test_diagonal_miss_near_a_corner(bullets):
+    # The box around this path overlaps the player, the path itself doesn't
+    player = Target((100, 100, 20, 20))
+    fire(bullets, (115, 90), (135, 110))
+    bullets.update(player)
+    assert player.hits == 0
+    assert len(bullets) == 1
+
+
+def test_diagonal_hit_through_a_corner(bullets):
+    player = Target((100, 100, 20, 20))
+    fire(bullets, (110, 90), (130, 110))
+    bullets.update(player)
+    assert player.hits == 1
+    assert len(bullets) == 0
+
+
+def test_fast_bullet_does_not_tunnel(bullets):
+    player = Target((100, 100, 20, 20))
+    fire(bullets, (0, 110), (400, 110))
+    bullets.update(player)
+    assert player.hits == 1
+
+
+def test_last_step_is_tested_before_expiring(bullets):
+    player = Target((140, -2, 4, 4))
+    sprite = bullets.sprite("assets/images/projectiles/Fireball1.png", 1)
+    bullets.spawn((0, 0), [0.0], 100, 150, 10, sprite)
+    bullets.radius[:bullets.count] = 0
+    bullets.update(player)
+    bullets.update(player)
+    assert player.hits == 1
+    assert len(bullets) == 0
@@ -0,0 +1,40 @@
+import contextlib
+import io
+
+from src.enemy import create_enemy
+from src.headless import HeadlessGame, kite_policy
+from src.snapshot import restore_snapshot, snapshot_bytes
+
+
+def add_demon(game):
+    x, y = game.player.position
+    demon = create_enemy("demon", x + 300, y, game.enemy_data, game.world)
+    game.world.add_enemy(demon)
+    return demon
+
+
+def test_save_and_restore_round_trip(game):
+    add_demon(game)
+    data = snapshot_bytes(game)
+    with contextlib.redirect_stdout(io.StringIO()):
+        restored = HeadlessGame()
+        restore_snapshot(restored, data)
+    assert snapshot_bytes(restored) == data
+
+
+def test_save_right_after_a_demon_is_killed(game):
+    demon = add_demon(game)
+    survivor = add_demon(game)
+    game.world.damage.add(demon, demon.hp)
+    game.world.damage.flush()
+    assert demon in game.world.enemies and demon.jump_event is None
+
+    data = snapshot_bytes(game)
+    with contextlib.redirect_stdout(io.StringIO()):
+        restored = HeadlessGame()
+        restore_snapshot(restored, data)
+    assert len(restored.world.enemies) == len(game.world.enemies) - 1
+    assert restored.world.enemies[-1].position == survivor.position
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        restored.step(kite_policy)